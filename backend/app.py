@@ -1,4 +1,4 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
@@ -10,36 +10,71 @@ db = SQLAlchemy()
 jwt = JWTManager()
 
 def create_app(config_class=Config):
-    app = Flask(__name__)
-    app.config.from_object(config_class)
+    # Heavy libraries (scikit-learn, SciPy, PyPDF2, python-docx) are imported
+    # on first use, and the schema is managed by `flask init-db` rather than
+    # checked on every boot, so that a worker is ready quickly
+    from services import startup
+    report = startup.StartupReport()
     
-    # Initialize extensions with app
-    db.init_app(app)
-    jwt.init_app(app)
-    CORS(app)
+    with report.phase('config'):
+        app = Flask(__name__)
+        app.config.from_object(config_class)
     
-    # Create upload folder
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    # Initialize extensions with app
+    with report.phase('extensions'):
+        from utils.database import configure_engine, engine_options
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+        db.init_app(app)
+        with app.app_context():
+            configure_engine(db.engine, app.config)
+        jwt.init_app(app)
+        CORS(app)
+        
+        # Create upload folder
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
     # Register blueprints
-    from routes.auth import auth_bp
-    from routes.resume import resume_bp
-    from routes.jobs import jobs_bp
+    with report.phase('blueprints'):
+        from routes.auth import auth_bp
+        from routes.resume import resume_bp
+        from routes.jobs import jobs_bp
+        
+        app.register_blueprint(auth_bp, url_prefix='/api/auth')
+        app.register_blueprint(resume_bp, url_prefix='/api/resume')
+        app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
     
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(resume_bp, url_prefix='/api/resume')
-    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    # Request latency, commit timing and optional profiling
+    with report.phase('metrics'):
+        from services import metrics
+        metrics.init_app(app)
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands
+    with report.phase('commands'):
+        from commands import register_commands
+        register_commands(app)
+    
+    app.extensions['startup_report'] = report
+    startup.publish(report)
+    report.log()
     
     @app.route('/api/health')
     def health():
         return jsonify({'status': 'healthy', 'message': 'Resume Analyzer API is running'})
     
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+    
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    # Development server: bring the schema up to date first
+    from models.schema import upgrade_schema
+    from services.shared import get_analysis_queue
+    with app.app_context():
+        upgrade_schema()
+        if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            # Only in the reloader's serving process
+            get_analysis_queue().start()
     app.run(debug=True, port=5000)
\ No newline at end of file
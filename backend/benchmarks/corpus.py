@@ -0,0 +1,130 @@
+import io
+import json
+import docx
+from services.skill_extractor import SkillExtractor
+
+# Filler vocabulary for resume and job text; none of these are skills
+_WORDS = (
+    'designed built maintained delivered improved reduced migrated owned led supported '
+    'customer platform service pipeline team product feature release system report data '
+    'internal external scalable reliable secure quarterly weekly daily project launch '
+    'the a an and with for across using within over under into from of to on in'
+).split()
+
+_SECTIONS = ('Experience', 'Education', 'Skills', 'Projects', 'Certifications')
+
+_DEGREES = ('Bachelor of Science', 'Master of Engineering', 'PhD', 'MBA', 'Associate degree')
+
+# Approximate word counts of the generated resumes
+RESUME_SIZES = {'small': 150, 'medium': 600, 'large': 3000}
+
+
+def skill_vocabulary():
+    """Distinct skills of the SkillExtractor database"""
+    return tuple(dict.fromkeys(SkillExtractor().skill_database))
+
+
+def make_resume_text(rng, words, vocabulary):
+    """Synthetic resume of about ``words`` words with sections, contacts and skills"""
+    skills = rng.sample(vocabulary, min(len(vocabulary), max(3, words // 40)))
+    lines = [
+        f'Candidate {rng.randrange(10 ** 6)}',
+        f'candidate{rng.randrange(10 ** 6)}@example.com | +1 555-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}',
+        f'{rng.randrange(1, 20)} years of experience',
+        ''
+    ]
+    written = 0
+    section_index = 0
+    while written < words:
+        lines.append(_SECTIONS[section_index % len(_SECTIONS)])
+        section_index += 1
+        for _ in range(rng.randrange(3, 8)):
+            sentence = rng.choices(_WORDS, k=rng.randrange(8, 16))
+            if skills and rng.random() < 0.5:
+                sentence.insert(rng.randrange(len(sentence)), rng.choice(skills))
+            lines.append(' '.join(sentence).capitalize() + '.')
+            written += len(sentence)
+        lines.append('')
+    lines.append(rng.choice(_DEGREES))
+    lines.append('Skills: ' + ', '.join(skills))
+    return '\n'.join(lines)
+
+
+def make_docx(text):
+    document = docx.Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_pdf(text, lines_per_page=50, line_width=90):
+    """Minimal uncompressed PDF with the text in Helvetica, one object per page"""
+    lines = []
+    for paragraph in text.split('\n'):
+        while len(paragraph) > line_width:
+            cut = paragraph.rfind(' ', 0, line_width)
+            cut = cut if cut > 0 else line_width
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * index} 0 R' for index in range(len(pages))), len(pages)
+        )).encode('ascii'),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    for index, page in enumerate(pages):
+        escaped = (line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page)
+        content = ('BT /F1 10 Tf 50 750 Td 12 TL ' + ' '.join(f"({line}) '" for line in escaped) + ' ET')
+        content = content.encode('latin-1', 'replace')
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>'
+        ).encode('ascii'))
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_documents(rng, vocabulary, per_size=5):
+    """``{(format, size): [bytes, ...]}`` for txt, docx and pdf in every size"""
+    documents = {}
+    for size, words in RESUME_SIZES.items():
+        texts = [make_resume_text(rng, words, vocabulary) for _ in range(per_size)]
+        documents[('txt', size)] = [text.encode('utf-8') for text in texts]
+        documents[('docx', size)] = [make_docx(text) for text in texts]
+        documents[('pdf', size)] = [make_pdf(text) for text in texts]
+    return documents
+
+
+def iter_jobs(rng, first_id, count, vocabulary):
+    """Yield ``count`` synthetic job postings as ``(columns, skills)`` pairs"""
+    for index in range(first_id, first_id + count):
+        skills = rng.sample(vocabulary, rng.randrange(2, 9))
+        yield {
+            'id': index,
+            'title': f'Engineer {index}',
+            'company': f'Company {index % 5000}',
+            'location': 'Remote',
+            'description': ' '.join(rng.choices(_WORDS, k=40)) + ' ' + ' '.join(skills),
+            'requirements': ' '.join(rng.choices(_WORDS, k=20)),
+            'required_skills': json.dumps(skills),
+            'experience_required': f'{rng.randrange(0, 12)}+ years',
+            'education_required': rng.choice(_DEGREES),
+            'is_active': True
+        }, skills
@@ -0,0 +1,207 @@
+"""Benchmarks for text extraction, skill extraction, analysis and job matching.
+
+Run from the backend directory::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --jobs 100,10000,1000000 --compare results.json
+
+Everything runs offline on a synthetic corpus (fixed seed) and a temporary
+SQLite database. Results are written as JSON; ``--compare`` prints the
+change against an earlier result file.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from benchmarks.corpus import RESUME_SIZES, iter_jobs, make_documents, skill_vocabulary
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    """Throughput and latency percentiles (milliseconds) of per-call timings in seconds"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'count': len(ordered),
+        'ops_per_sec': round(len(ordered) / total, 2) if total else None,
+        'mean_ms': round(total / len(ordered) * 1000, 4),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 4),
+        'p90_ms': round(percentile(ordered, 0.90) * 1000, 4),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 4),
+        'min_ms': round(ordered[0] * 1000, 4),
+        'max_ms': round(ordered[-1] * 1000, 4)
+    }
+
+
+def measure(func, inputs, repeat, warmup=1):
+    """Time ``func(item)`` for every input, ``repeat`` rounds, after warm-up calls"""
+    for item in inputs[:warmup]:
+        func(item)
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            func(item)
+            samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_parsing(documents, repeat):
+    from services.resume_parser import ResumeParser
+
+    parser = ResumeParser()
+    results = {}
+    for (file_format, size), items in sorted(documents.items()):
+        results[f'extract_text.{file_format}.{size}'] = measure(parser.extract_text, items, repeat)
+
+    for size in RESUME_SIZES:
+        texts = [data.decode('utf-8') for data in documents[('txt', size)]]
+        results[f'extract_skills.{size}'] = measure(parser.skill_extractor.extract_skills, texts, repeat * 5)
+        results[f'analyze_resume.{size}'] = measure(parser.analyze_resume, texts, repeat * 5)
+    return results
+
+
+def _load_jobs(db, rng, first_id, count, vocabulary, chunk_size=10000):
+    """Bulk insert synthetic jobs and their skill index rows"""
+    from models.job import Job
+
+    jobs = iter_jobs(rng, first_id, count, vocabulary)
+    while True:
+        chunk = [dict(columns, required_skills=skills) for _, (columns, skills) in zip(range(chunk_size), jobs)]
+        if not chunk:
+            break
+        Job.bulk_write(chunk)
+        db.session.commit()
+
+
+def bench_matching(catalog_sizes, documents, repeat, rng, vocabulary):
+    from config import Config
+
+    workdir = tempfile.mkdtemp(prefix='resume-analyzer-bench-')
+
+    class BenchmarkConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+        UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        MATCH_CACHE_BACKEND = 'memory'
+        ANALYSIS_ASYNC = False
+
+    from app import create_app, db
+    from models.schema import upgrade_schema
+    from services.shared import get_match_cache
+
+    results = {}
+    try:
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            upgrade_schema()
+        client = app.test_client()
+        response = client.post('/api/auth/register', json={'email': 'bench@example.com', 'password': 'bench'})
+        headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+        resume_ids = []
+        for data in documents[('txt', 'medium')]:
+            response = client.post('/api/resume/upload', json={'text': data.decode('utf-8')}, headers=headers)
+            resume_ids.append(response.get_json()['resume']['id'])
+
+        loaded = 0
+        for size in sorted(catalog_sizes):
+            with app.app_context():
+                started = time.perf_counter()
+                _load_jobs(db, rng, loaded + 1, size - loaded, vocabulary)
+                load_seconds = time.perf_counter() - started
+            loaded = size
+
+            def match(resume_id):
+                response = client.get(f'/api/jobs/match/{resume_id}?limit=20', headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f'Match request failed: {response.status_code}')
+
+            def match_cold(resume_id):
+                with app.app_context():
+                    get_match_cache().backend.clear()
+                match(resume_id)
+
+            results[f'api_match.cold.{size}'] = measure(match_cold, resume_ids, repeat)
+            results[f'api_match.warm.{size}'] = measure(match, resume_ids, repeat)
+            results[f'api_match.cold.{size}']['catalog_load_seconds'] = round(load_seconds, 3)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(current, baseline):
+    """Print the p50 and throughput change of every benchmark present in both runs"""
+    print(f"{'benchmark':40} {'p50 ms':>12} {'change':>9} {'ops/s':>12} {'change':>9}")
+    for name, stats in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        p50_change = (stats['p50_ms'] / before['p50_ms'] - 1) * 100 if before['p50_ms'] else 0.0
+        ops_change = (stats['ops_per_sec'] / before['ops_per_sec'] - 1) * 100 if before['ops_per_sec'] else 0.0
+        print(f"{name:40} {stats['p50_ms']:12.4f} {p50_change:+8.1f}% {stats['ops_per_sec']:12.2f} {ops_change:+8.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', default='100,1000,10000',
+                        help='Comma-separated job catalogue sizes (up to 1000000)')
+    parser.add_argument('--documents', type=int, default=5, help='Documents per format and size')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed rounds over the inputs')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--skip', default='', help='Comma-separated groups to skip: parsing, matching')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier JSON result file to compare against')
+    args = parser.parse_args(argv)
+
+    catalog_sizes = [int(size) for size in args.jobs.split(',') if size]
+    skip = set(filter(None, args.skip.split(',')))
+    rng = random.Random(args.seed)
+    vocabulary = skill_vocabulary()
+    documents = make_documents(rng, vocabulary, per_size=args.documents)
+
+    results = {}
+    if 'parsing' not in skip:
+        results.update(bench_parsing(documents, args.repeat))
+    if 'matching' not in skip:
+        results.update(bench_matching(catalog_sizes, documents, args.repeat, rng, vocabulary))
+
+    import numpy
+    report = {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': numpy.__version__,
+            'seed': args.seed,
+            'documents': args.documents,
+            'repeat': args.repeat,
+            'jobs': catalog_sizes
+        },
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as out:
+            out.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import click
+from app import db
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db():
+        """Create missing tables, columns and indexes.
+        
+        Run once per deploy, before starting the web workers: the app does
+        not touch the schema when it starts.
+        """
+        from models.schema import upgrade_schema
+        
+        changes = upgrade_schema()
+        for change in changes:
+            click.echo(change.capitalize())
+        click.echo(f'Schema up to date ({len(changes)} changes)')
+    
+    @app.cli.command('startup-report')
+    @click.option('--preload', is_flag=True, help='Also time preloading the heavy modules')
+    def startup_report(preload):
+        """Print how long each application startup phase took"""
+        from services import startup
+        
+        report = app.extensions['startup_report']
+        if preload:
+            startup.preload(app)
+        for name, seconds in report.phases:
+            click.echo(f'{name:40} {seconds * 1000:9.1f} ms')
+        click.echo(f"{'total':40} {report.total * 1000:9.1f} ms")
+    
+    @app.cli.command('migrate-skills')
+    @click.option('--batch-size', type=int, default=1000, help='Rows per commit')
+    def migrate_skills(batch_size):
+        """Fill the skills dictionary and the job/resume skill tables from the JSON columns"""
+        from models.job import Job
+        from models.resume import Resume
+        
+        # job_skills used to hold skill names; it is rebuilt with skill ids
+        inspector = db.inspect(db.engine)
+        if 'job_skills' in inspector.get_table_names():
+            columns = {column['name'] for column in inspector.get_columns('job_skills')}
+            if 'skill_id' not in columns:
+                db.session.execute(db.text('DROP TABLE job_skills'))
+                db.session.commit()
+        
+        from models.schema import upgrade_schema
+        upgrade_schema()
+        
+        for model, setter, getter in (
+            (Job, Job.set_required_skills, Job.get_required_skills),
+            (Resume, Resume.set_skills, Resume.get_skills)
+        ):
+            count = 0
+            last_id = 0
+            while True:
+                rows = model.query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+                for row in rows:
+                    setter(row, getter(row))
+                db.session.commit()
+                count += len(rows)
+                last_id = rows[-1].id
+            click.echo(f'Indexed skills for {count} {model.__tablename__}')
+    
+    @app.cli.command('migrate-texts')
+    @click.option('--batch-size', type=int, default=500, help='Rows per commit')
+    @click.option('--vacuum', is_flag=True, help='Rebuild the SQLite file afterwards to release the space')
+    def migrate_texts(batch_size, vacuum):
+        """Move extracted text out of resumes and resume_analyses into document_texts"""
+        from models.resume import DocumentText
+        from models.schema import upgrade_schema
+        from services.analysis_cache import content_hash
+        
+        upgrade_schema()
+        inspector = db.inspect(db.engine)
+        for table, key in (('resume_analyses', 'content_hash'), ('resumes', 'id')):
+            # Databases created since the move have no raw_text columns
+            if 'raw_text' not in {column['name'] for column in inspector.get_columns(table)}:
+                continue
+            select = db.text(
+                f'SELECT {key} AS key, content_hash, raw_text FROM {table} WHERE raw_text IS NOT NULL LIMIT :limit'
+            )
+            update = db.text(f'UPDATE {table} SET raw_text = NULL, content_hash = :digest WHERE {key} = :key')
+            count = 0
+            while True:
+                rows = db.session.execute(select, {'limit': batch_size}).all()
+                if not rows:
+                    break
+                # Rows from before content hashing are keyed by their text
+                digests = [row.content_hash or content_hash(row.raw_text) for row in rows]
+                DocumentText.bulk_store({digest: row.raw_text for digest, row in zip(digests, rows)})
+                db.session.execute(update, [{'digest': digest, 'key': row.key} for digest, row in zip(digests, rows)])
+                db.session.commit()
+                count += len(rows)
+            click.echo(f'Moved the text of {count} {table}')
+        
+        if vacuum and db.engine.dialect.name == 'sqlite':
+            with db.engine.connect() as connection:
+                connection.execute(db.text('VACUUM'))
+            click.echo('Vacuumed the database')
+    
+    @app.cli.command('ingest-resumes')
+    @click.argument('directory', type=click.Path(exists=True, file_okay=False))
+    @click.option('--user-id', type=int, required=True, help='Owner of the ingested resumes')
+    @click.option('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+    @click.option('--batch-size', type=int, default=None, help='Resumes per commit')
+    def ingest_resumes(directory, user_id, workers, batch_size):
+        """Parse and store every txt/pdf/docx resume below DIRECTORY"""
+        from routes.resume import ALLOWED_EXTENSIONS
+        from services.analysis_worker import worker_config
+        from services.bulk_ingest import BulkIngestor, iter_directory_documents
+        from services.shared import get_storage, get_analysis_cache
+        
+        config = app.config
+        ingestor = BulkIngestor(
+            get_storage(),
+            get_analysis_cache(),
+            workers=workers or config['ANALYSIS_WORKERS'],
+            batch_size=batch_size or config['BULK_BATCH_SIZE'],
+            start_method=config['ANALYSIS_START_METHOD'],
+            worker_config=worker_config(config)
+        )
+        summary = ingestor.ingest(user_id, iter_directory_documents(directory, ALLOWED_EXTENSIONS))
+        
+        click.echo(f"Ingested {summary['ingested']} resumes ({summary['cached']} already analyzed)")
+        for failure in summary['failed']:
+            click.echo(f"Failed {failure['filename']}: {failure['error']}", err=True)
+    
+    @app.cli.command('import-jobs')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), default=None,
+                  help='Input format (default: from the file extension)')
+    @click.option('--batch-size', type=int, default=None, help='Jobs per commit')
+    def import_jobs(path, file_format, batch_size):
+        """Import job postings from a CSV or NDJSON file.
+        
+        Postings with an external_id replace the ones imported under that id
+        before, so the same export can be imported again. This is the way to
+        run the nightly ATS sync; the HTTP endpoint only takes small files.
+        """
+        from services.job_import import JobImporter, detect_format, iter_job_records
+        from services.shared import get_skill_extractor
+        
+        file_format = file_format or detect_format(path)
+        if file_format is None:
+            raise click.UsageError('Cannot tell the format from the file name; pass --format')
+        
+        importer = JobImporter(get_skill_extractor(), batch_size=batch_size or app.config['JOB_IMPORT_BATCH_SIZE'])
+        total = 0
+        failed = 0
+        with open(path, 'rb') as file:
+            for batch in importer.run(iter_job_records(file, file_format)):
+                total += batch['imported']
+                failed += len(batch['errors'])
+                for error in batch['errors']:
+                    click.echo(f"Line {error['line']}: {error['error']}", err=True)
+                click.echo(f"Imported {total} jobs (up to line {batch['last_line']}; "
+                           f"{batch['extracted_skills']} with skills taken from the text)")
+        click.echo(f'Done, {total} jobs imported, {failed} rows failed')
+    
+    @app.cli.command('reindex-resumes')
+    @click.option('--batch-size', type=int, default=None, help='Resumes per commit')
+    @click.option('--max-load', type=float, default=None, help='Busy share of wall time, 0-1')
+    @click.option('--limit', type=int, default=None, help='Stop after this many resumes')
+    def reindex_resumes(batch_size, max_load, limit):
+        """Re-analyze resumes made with an older skill vocabulary or rules.
+        
+        Safe to interrupt and run again: it continues with the rows still stale.
+        """
+        from services.reindex import ResumeReindexer
+        from services.shared import get_resume_parser
+        
+        config = app.config
+        reindexer = ResumeReindexer(
+            get_resume_parser(),
+            batch_size=batch_size or config['REINDEX_BATCH_SIZE'],
+            max_load=max_load or config['REINDEX_MAX_LOAD']
+        )
+        click.echo(f'{reindexer.stale_query().count()} resumes to re-analyze')
+        total = 0
+        for batch in reindexer.run(limit=limit):
+            total += batch['resumes']
+            stages = ', '.join(f'{name}: {count}' for name, count in sorted(batch['stages'].items()))
+            click.echo(f"Re-analyzed {total} (up to id {batch['last_id']}; {stages})")
+        click.echo(f'Done, {total} resumes re-analyzed')
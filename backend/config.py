@@ -5,7 +5,82 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///resume_analyzer.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool presets, picked with DATABASE_PROFILE: 'web' for the
+    # request workers, 'batch' for CLI jobs. DB_POOL_* override single values.
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE') or 'web'
+    DATABASE_PROFILES = {
+        'web': {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30, 'pool_recycle': 1800, 'pool_pre_ping': True},
+        'batch': {'pool_size': 2, 'max_overflow': 0, 'pool_timeout': 120, 'pool_recycle': 3600, 'pool_pre_ping': True}
+    }
+    DB_POOL_SIZE = int(os.environ['DB_POOL_SIZE']) if os.environ.get('DB_POOL_SIZE') else None
+    DB_MAX_OVERFLOW = int(os.environ['DB_MAX_OVERFLOW']) if os.environ.get('DB_MAX_OVERFLOW') else None
+    DB_POOL_TIMEOUT = float(os.environ['DB_POOL_TIMEOUT']) if os.environ.get('DB_POOL_TIMEOUT') else None
+    DB_POOL_RECYCLE = int(os.environ['DB_POOL_RECYCLE']) if os.environ.get('DB_POOL_RECYCLE') else None  # seconds
+    # SQLite connection pragmas: WAL so reads do not block on the writer,
+    # and writers wait up to SQLITE_BUSY_TIMEOUT seconds for the lock
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 15))
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     UPLOAD_FOLDER = 'uploads'
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
\ No newline at end of file
+    # Upload storage: 'local' (sharded directories under UPLOAD_FOLDER) or
+    # 'object' (S3-compatible bucket; a local stand-in without an endpoint)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND') or 'local'
+    STORAGE_BUCKET = os.environ.get('STORAGE_BUCKET') or 'resumes'
+    STORAGE_ENDPOINT_URL = os.environ.get('STORAGE_ENDPOINT_URL')
+    STORE_UPLOADS = os.environ.get('STORE_UPLOADS', 'true').lower() in ('1', 'true', 'yes')  # keep original files
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))  # pages read per PDF
+    PDF_TIME_LIMIT = float(os.environ.get('PDF_TIME_LIMIT', 20))  # seconds per PDF
+    # Skill extraction: 'regex' (exact names) or 'spacy' (EntityRuler with
+    # aliases; SPACY_MODEL is optional, a blank pipeline is used without it)
+    SKILL_ENGINE = os.environ.get('SKILL_ENGINE') or 'regex'
+    SPACY_MODEL = os.environ.get('SPACY_MODEL')
+    SKILL_ENGINE_PROCESSES = int(os.environ.get('SKILL_ENGINE_PROCESSES', 1))  # nlp.pipe n_process in bulk jobs
+    LIST_DEFAULT_LIMIT = 50
+    LIST_MAX_LIMIT = 200
+    MATCH_DEFAULT_LIMIT = 50
+    MATCH_MAX_LIMIT = 200
+    
+    # Job match cache: 'memory' (per process) or 'sqlite' (shared by workers)
+    MATCH_CACHE_BACKEND = os.environ.get('MATCH_CACHE_BACKEND') or 'memory'
+    MATCH_CACHE_PATH = os.environ.get('MATCH_CACHE_PATH') or 'match_cache.db'
+    MATCH_CACHE_MAX_ENTRIES = 1024
+    MATCH_CACHE_TTL = 300  # seconds
+    JOB_JSON_CACHE_SIZE = 5000  # serialized jobs kept per process
+    
+    # Background analysis: uploads return 202 and are parsed on a process pool
+    ANALYSIS_ASYNC = os.environ.get('ANALYSIS_ASYNC', '').lower() in ('1', 'true', 'yes')
+    ANALYSIS_WORKERS = None  # defaults to the CPU count
+    ANALYSIS_POLL_INTERVAL = 1.0  # seconds
+    ANALYSIS_STALE_AFTER = 600  # seconds before a 'processing' row is retried
+    ANALYSIS_START_METHOD = 'spawn'  # multiprocessing start method of the worker pools
+    BULK_BATCH_SIZE = 200  # resumes per commit in bulk ingestion
+    BULK_SYNC_MAX_DOCUMENTS = 20  # larger bulk uploads go to the background queue unless ?async=0
+    # Limits per bulk upload, counting every document inside zip archives
+    # at its uncompressed size; larger uploads are refused with 413
+    BULK_MAX_DOCUMENTS = int(os.environ.get('BULK_MAX_DOCUMENTS', 1000))
+    BULK_MAX_TOTAL_BYTES = int(os.environ.get('BULK_MAX_TOTAL_BYTES', 256 * 1024 * 1024))
+    REINDEX_BATCH_SIZE = 100  # resumes per commit when refreshing stale analyses
+    REINDEX_MAX_LOAD = 0.5  # share of wall time the re-index job may be busy
+    
+    # Request profiling: when enabled, requests sent with ?profile=1 (or an
+    # X-Profile: 1 header) and a random PROFILE_SAMPLE_RATE share of all
+    # requests are run under cProfile, with the stats saved to PROFILE_DIR
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or 'profiles'
+    
+    # Bulk job import (NDJSON or CSV): rows per normalization pass and
+    # commit, and how many row errors are reported back. POST /api/jobs/import
+    # takes at most JOB_IMPORT_MAX_ROWS rows; run full catalogue syncs with
+    # `flask import-jobs`, outside the web workers
+    JOB_IMPORT_BATCH_SIZE = int(os.environ.get('JOB_IMPORT_BATCH_SIZE', 1000))
+    JOB_IMPORT_MAX_ERRORS = 100
+    JOB_IMPORT_MAX_ROWS = int(os.environ.get('JOB_IMPORT_MAX_ROWS', 5000))
+    
+    # Job -> candidate search over an in-memory skill bitset index
+    CANDIDATE_DEFAULT_LIMIT = 20
+    CANDIDATE_MAX_LIMIT = 200
+    CANDIDATE_INDEX_MAX_STALENESS = 30  # seconds an outdated index is served before a background rebuild
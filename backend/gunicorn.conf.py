@@ -0,0 +1,38 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py wsgi:app``
+
+The app is loaded once in the master and the heavy libraries are imported
+there before the workers are forked, so a new worker starts with them
+already in (copy-on-write shared) memory instead of importing them itself.
+Run ``flask init-db`` before the first start and after upgrades.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
+
+_preloaded = False
+
+
+def pre_fork(server, worker):
+    global _preloaded
+    if not _preloaded:
+        from services import startup
+
+        app = server.app.wsgi()
+        report = startup.preload(app)
+        server.log.info('Startup report: %s', report.as_dict())
+        _preloaded = True
+
+
+def post_fork(server, worker):
+    # Never reuse database connections opened in the master
+    from app import db
+    from services.shared import get_analysis_queue
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+        # Pick up rows left pending or processing by a previous run
+        get_analysis_queue().start()
@@ -0,0 +1,47 @@
+from app import db
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class CatalogVersion(db.Model):
+    """Monotonic version counter per catalogue, bumped on every change"""
+    __tablename__ = 'catalog_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    @classmethod
+    def current(cls, name):
+        row = db.session.get(cls, name)
+        return row.version if row else 0
+    
+    @classmethod
+    def bump(cls, connection, name):
+        table = cls.__table__
+        result = connection.execute(
+            table.update().where(table.c.name == name).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(name=name, version=1))
+
+
+# Model classes whose changes bump a catalogue version, by catalogue name
+tracked_models = {}
+
+def track_catalog(name):
+    """Class decorator: bump catalogue ``name`` whenever a flush touches the model"""
+    def decorator(model):
+        tracked_models[model] = name
+        return model
+    return decorator
+
+@event.listens_for(Session, 'before_flush')
+def _bump_changed_catalogs(session, flush_context, instances):
+    changed = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = tracked_models.get(type(obj))
+        if name and (obj in session.new or obj in session.deleted or session.is_modified(obj)):
+            changed.add(name)
+    if changed:
+        connection = session.connection()
+        for name in sorted(changed):
+            CatalogVersion.bump(connection, name)
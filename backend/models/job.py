@@ -1,11 +1,16 @@
 from app import db
+from models.catalog import CatalogVersion, track_catalog
+from models.skill import Skill
+from utils.database import bulk_insert, table_rows, upsert
 from datetime import datetime
 import json
 
+@track_catalog('jobs')
 class Job(db.Model):
     __tablename__ = 'jobs'
     
     id = db.Column(db.Integer, primary_key=True)
+    external_id = db.Column(db.String(100), unique=True, index=True)  # id in the source system of imported jobs
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200))
@@ -18,23 +23,108 @@ class Job(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Inverted index rows (skill id -> job), kept in sync by set_required_skills.
+    # required_skills keeps the names as given, for display.
+    skill_entries = db.relationship('JobSkill', backref='job', lazy=True, cascade='all, delete-orphan')
+    
     def set_required_skills(self, skills_list):
         self.required_skills = json.dumps(skills_list)
+        self.skill_entries = [JobSkill(skill_id=skill_id) for skill_id in Skill.ids_for(skills_list, create=True)]
     
     def get_required_skills(self):
         return json.loads(self.required_skills) if self.required_skills else []
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'salary_range': self.salary_range,
-            'description': self.description,
-            'requirements': self.requirements,
-            'required_skills': self.get_required_skills(),
-            'experience_required': self.experience_required,
-            'education_required': self.education_required,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    def get_skill_ids(self):
+        return [entry.skill_id for entry in self.skill_entries]
+    
+    # API fields: the columns each one reads, and how it is serialized
+    api_fields = {
+        'id': (('id',), lambda job: job.id),
+        'external_id': (('external_id',), lambda job: job.external_id),
+        'title': (('title',), lambda job: job.title),
+        'company': (('company',), lambda job: job.company),
+        'location': (('location',), lambda job: job.location),
+        'salary_range': (('salary_range',), lambda job: job.salary_range),
+        'description': (('description',), lambda job: job.description),
+        'requirements': (('requirements',), lambda job: job.requirements),
+        'required_skills': (('required_skills',), lambda job: job.get_required_skills()),
+        'experience_required': (('experience_required',), lambda job: job.experience_required),
+        'education_required': (('education_required',), lambda job: job.education_required),
+        'created_at': (('created_at',), lambda job: job.created_at.isoformat())
+    }
+    # API fields whose column already holds their JSON text
+    json_columns = {'required_skills': 'required_skills'}
+    
+    __table_args__ = (
+        db.Index('ix_jobs_is_active_created_at', 'is_active', 'created_at'),
+    )
+    
+    def to_dict(self, fields=None):
+        return {field: self.api_fields[field][1](self) for field in (fields or self.api_fields)}
+    
+    @classmethod
+    def catalog_version(cls):
+        """Version of the job catalogue; changes whenever any job changes"""
+        return CatalogVersion.current('jobs')
+    
+    @classmethod
+    def bulk_write(cls, records):
+        """Insert or replace many jobs in batched statements; return their ids.
+        
+        ``records`` are dicts of column values, with ``required_skills`` as a
+        list of names. A record with an ``id``, or else an ``external_id``,
+        replaces the job with that key (keeping its created_at and
+        external_id) or is inserted if there is none; the others become new
+        jobs. Keys must be unique within one call. The job_skills rows are rewritten alongside
+        and the catalogue version is bumped once. Nothing is committed.
+        """
+        connection = db.session.connection()
+        table = cls.__table__
+        skill_ids = Skill.id_map([skill for record in records for skill in record.get('required_skills') or []])
+        
+        def key_of(record):
+            if record.get('id') is not None:
+                return 'id'
+            return 'external_id' if record.get('external_id') is not None else None
+        
+        ids = [None] * len(records)
+        for key in ('id', 'external_id', None):
+            positions = [index for index, record in enumerate(records) if key_of(record) == key]
+            if not positions:
+                continue
+            rows = table_rows(table, [records[index] for index in positions], exclude=() if key == 'id' else ('id',))
+            for row in rows:
+                row['required_skills'] = json.dumps(row['required_skills'] or [])
+            if key is None:
+                written = bulk_insert(connection, table, rows, returning=[cls.id])
+            else:
+                update_columns = [name for name in rows[0] if name not in ('id', 'external_id', 'created_at')]
+                written = upsert(connection, table, rows, [key], update_columns=update_columns, returning=[cls.id])
+            for index, row in zip(positions, written):
+                ids[index] = row.id
+            if key is not None:
+                connection.execute(JobSkill.__table__.delete().where(JobSkill.job_id.in_([ids[index] for index in positions])))
+        
+        bulk_insert(connection, JobSkill.__table__, [
+            {'job_id': job_id, 'skill_id': skill_id}
+            for job_id, record in zip(ids, records)
+            for skill_id in dict.fromkeys(skill_ids[skill] for skill in record.get('required_skills') or [])
+        ])
+        if ids:
+            CatalogVersion.bump(connection, 'jobs')
+        return ids
+    
+    @classmethod
+    def query_for_skills(cls, skill_ids):
+        """Active jobs sharing at least one skill id, plus jobs requiring no skills"""
+        job_ids = db.session.query(JobSkill.job_id).filter(JobSkill.skill_id.in_(list(skill_ids)))
+        return cls.query.filter_by(is_active=True).filter(
+            db.or_(cls.id.in_(job_ids), ~cls.skill_entries.any())
+        )
+
+
+class JobSkill(db.Model):
+    __tablename__ = 'job_skills'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True, index=True)
\ No newline at end of file
@@ -1,7 +1,17 @@
 from app import db
+from models.catalog import CatalogVersion, track_catalog
+from models.skill import Skill
+from utils.database import bulk_insert, table_rows, upsert
 from datetime import datetime
+import hashlib
 import json
+import zlib
 
+# zlib level for stored document text (the zlib default; level 9 makes
+# text barely smaller at a higher CPU cost)
+TEXT_COMPRESSION_LEVEL = 6
+
+@track_catalog('resumes')
 class Resume(db.Model):
     __tablename__ = 'resumes'
     
@@ -9,7 +19,9 @@ class Resume(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     filename = db.Column(db.String(255))
     file_path = db.Column(db.String(500))
-    raw_text = db.Column(db.Text)
+    # SHA-256 of the uploaded bytes; the extracted text is kept, compressed,
+    # under this hash in document_texts (see raw_text)
+    content_hash = db.Column(db.String(64), index=True)
     
     # Analysis results
     skills = db.Column(db.Text)  # JSON string
@@ -20,27 +32,232 @@ class Resume(db.Model):
     has_email = db.Column(db.Boolean, default=False)
     has_phone = db.Column(db.Boolean, default=False)
     
+    # Analysis status: pending -> processing -> completed | failed
+    status = db.Column(db.String(20), default='completed', index=True)
+    analysis_error = db.Column(db.Text)
+    
+    # Stage versions the analysis was made with (JSON), and a digest of them
+    # for finding rows analyzed with older rules
+    analysis_versions = db.Column(db.Text)
+    analysis_version = db.Column(db.String(12), index=True)
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Normalized copy of skills (resume -> skill id) for indexed lookups.
+    # skills keeps the names as found, for display.
+    skill_entries = db.relationship('ResumeSkill', backref='resume', lazy=True, cascade='all, delete-orphan')
+    
     def set_skills(self, skills_list):
         self.skills = json.dumps(skills_list)
+        self.skill_entries = [ResumeSkill(skill_id=skill_id) for skill_id in Skill.ids_for(skills_list, create=True)]
     
     def get_skills(self):
         return json.loads(self.skills) if self.skills else []
     
-    def to_dict(self):
+    def get_skill_ids(self):
+        return [entry.skill_id for entry in self.skill_entries]
+    
+    @property
+    def raw_text(self):
+        """Extracted text, read from document_texts on each access"""
+        return DocumentText.load(self.content_hash) if self.content_hash else None
+    
+    def apply_analysis(self, analysis, versions):
+        """Copy the stored fields of a ResumeParser analysis onto the row"""
+        for name, value in self.analysis_columns(analysis, versions).items():
+            setattr(self, name, value)
+        if self.skills is None or analysis['skills'] != self.get_skills():
+            self.set_skills(analysis['skills'])
+    
+    @classmethod
+    def analysis_columns(cls, analysis, versions):
+        """Column values recording a completed analysis, except the skills"""
+        return {
+            'experience_years': analysis['experience_years'],
+            'education': analysis['education'],
+            'ats_score': analysis['ats_score'],
+            'word_count': analysis['word_count'],
+            'has_email': analysis['has_email'],
+            'has_phone': analysis['has_phone'],
+            'analysis_versions': json.dumps(versions),
+            'analysis_version': cls.version_key(versions),
+            'status': 'completed',
+            'analysis_error': None
+        }
+    
+    def get_analysis_versions(self):
+        return json.loads(self.analysis_versions) if self.analysis_versions else {}
+    
+    def stored_analysis(self):
+        """The analysis fields kept on the row, as ResumeParser returns them"""
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'filename': self.filename,
             'skills': self.get_skills(),
             'experience_years': self.experience_years,
             'education': self.education,
             'ats_score': self.ats_score,
             'word_count': self.word_count,
             'has_email': self.has_email,
-            'has_phone': self.has_phone,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
\ No newline at end of file
+            'has_phone': self.has_phone
+        }
+    
+    @staticmethod
+    def version_key(versions):
+        """Short digest of a stage -> version mapping"""
+        return hashlib.sha1(json.dumps(versions, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    
+    # API fields: the columns each one reads, and how it is serialized
+    api_fields = {
+        'id': (('id',), lambda resume: resume.id),
+        'user_id': (('user_id',), lambda resume: resume.user_id),
+        'filename': (('filename',), lambda resume: resume.filename),
+        'skills': (('skills',), lambda resume: resume.get_skills()),
+        'experience_years': (('experience_years',), lambda resume: resume.experience_years),
+        'education': (('education',), lambda resume: resume.education),
+        'ats_score': (('ats_score',), lambda resume: resume.ats_score),
+        'word_count': (('word_count',), lambda resume: resume.word_count),
+        'has_email': (('has_email',), lambda resume: resume.has_email),
+        'has_phone': (('has_phone',), lambda resume: resume.has_phone),
+        'status': (('status',), lambda resume: resume.status),
+        'created_at': (('created_at',), lambda resume: resume.created_at.isoformat()),
+        'updated_at': (('updated_at',), lambda resume: resume.updated_at.isoformat())
+    }
+    # API fields whose column already holds their JSON text
+    json_columns = {'skills': 'skills'}
+    
+    __table_args__ = (
+        db.Index('ix_resumes_user_id_created_at', 'user_id', 'created_at'),
+    )
+    
+    def to_dict(self, fields=None):
+        return {field: self.api_fields[field][1](self) for field in (fields or self.api_fields)}
+    
+    @classmethod
+    def bulk_insert(cls, records):
+        """Insert many resumes in batched statements and return their ids.
+        
+        ``records`` are dicts of column values, with ``skills`` as a list of
+        names (or None when not analyzed). The resume_skills rows are written
+        alongside and the catalogue version is bumped once. Nothing is
+        committed.
+        """
+        connection = db.session.connection()
+        skill_lists = [record.get('skills') for record in records]
+        skill_ids = Skill.id_map([skill for skills in skill_lists if skills for skill in skills])
+        
+        rows = table_rows(cls.__table__, records, exclude=('id',))
+        for row, skills in zip(rows, skill_lists):
+            row['skills'] = json.dumps(skills) if skills is not None else None
+        ids = [row.id for row in bulk_insert(connection, cls.__table__, rows, returning=[cls.id])]
+        
+        bulk_insert(connection, ResumeSkill.__table__, [
+            {'resume_id': resume_id, 'skill_id': skill_id}
+            for resume_id, skills in zip(ids, skill_lists) if skills
+            for skill_id in dict.fromkeys(skill_ids[skill] for skill in skills)
+        ])
+        if ids:
+            CatalogVersion.bump(connection, 'resumes')
+        return ids
+    
+    @classmethod
+    def query_with_skills(cls, names):
+        """Resumes having every named skill, through the resume_skills index"""
+        names = list(dict.fromkeys(names))
+        skill_ids = Skill.ids_for(names)
+        if len(skill_ids) < len(names):
+            # A skill no resume was ever analyzed with
+            return cls.query.filter(db.false())
+        query = cls.query
+        for skill_id in skill_ids:
+            resume_ids = db.session.query(ResumeSkill.resume_id).filter(ResumeSkill.skill_id == skill_id)
+            query = query.filter(cls.id.in_(resume_ids))
+        return query
+
+
+class ResumeSkill(db.Model):
+    __tablename__ = 'resume_skills'
+    
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True, index=True)
+
+
+class ResumeAnalysis(db.Model):
+    """Analysis of a document, addressed by content hash"""
+    __tablename__ = 'resume_analyses'
+    
+    content_hash = db.Column(db.String(64), primary_key=True)
+    analysis = db.Column(db.Text)  # JSON string
+    analysis_versions = db.Column(db.Text)  # JSON string, stage -> version
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def raw_text(self):
+        """Extracted text, read from document_texts on each access"""
+        return DocumentText.load(self.content_hash)
+    
+    def set_analysis(self, analysis, versions):
+        self.analysis = json.dumps(analysis)
+        self.analysis_versions = json.dumps(versions)
+    
+    def get_analysis(self):
+        return json.loads(self.analysis) if self.analysis else {}
+    
+    def get_analysis_versions(self):
+        return json.loads(self.analysis_versions) if self.analysis_versions else {}
+    
+    @classmethod
+    def bulk_store(cls, records):
+        """Insert many analyses and their texts; content already stored is left as is.
+        
+        ``records`` are dicts with content_hash, raw_text, analysis and
+        analysis_versions (the last two as dicts). Nothing is committed.
+        """
+        DocumentText.bulk_store({record['content_hash']: record['raw_text'] for record in records})
+        rows = table_rows(cls.__table__, [
+            {'content_hash': record['content_hash'], 'analysis': json.dumps(record['analysis']),
+             'analysis_versions': json.dumps(record['analysis_versions'])}
+            for record in records
+        ])
+        upsert(db.session.connection(), cls.__table__, rows, ['content_hash'], update_columns=())
+
+
+class DocumentText(db.Model):
+    """Extracted text of a document, zlib-compressed, addressed by content hash.
+    
+    Kept apart from resumes and resume_analyses so that listing and matching
+    scan compact rows; the text is only read to re-analyze a document. Rows
+    are shared by every resume with the same content and never change.
+    """
+    __tablename__ = 'document_texts'
+    
+    content_hash = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    
+    @staticmethod
+    def compress(text):
+        return zlib.compress(text.encode('utf-8'), TEXT_COMPRESSION_LEVEL)
+    
+    @staticmethod
+    def decompress(data):
+        return zlib.decompress(data).decode('utf-8')
+    
+    @classmethod
+    def load(cls, digest):
+        data = db.session.query(cls.data).filter(cls.content_hash == digest).scalar()
+        return cls.decompress(data) if data is not None else None
+    
+    @classmethod
+    def load_many(cls, digests):
+        """``{content_hash: text}`` for the stored ones among ``digests``"""
+        rows = db.session.query(cls.content_hash, cls.data).filter(cls.content_hash.in_(set(digests)))
+        return {digest: cls.decompress(data) for digest, data in rows}
+    
+    @classmethod
+    def bulk_store(cls, texts):
+        """Store ``{content_hash: text}``, skipping hashes already stored. Nothing is committed."""
+        rows = [{'content_hash': digest, 'data': cls.compress(text)} for digest, text in texts.items() if text is not None]
+        upsert(db.session.connection(), cls.__table__, rows, ['content_hash'], update_columns=())
+    
+    @classmethod
+    def store(cls, digest, text):
+        cls.bulk_store({digest: text})
@@ -0,0 +1,45 @@
+from app import db
+from sqlalchemy.schema import CreateColumn
+
+def upgrade_schema():
+    """Create missing tables, columns and indexes; return what was changed.
+
+    Tables are created whole. Columns added to a model after its table was
+    created are added with ALTER TABLE (they must be nullable or have a
+    default, which existing rows then take), and their indexes are created.
+    Nothing is dropped or altered, so running it again is a no-op.
+    """
+    # Register every model on the metadata
+    from models import catalog, job, resume, skill, user
+
+    engine = db.engine
+    inspector = db.inspect(engine)
+    existing = set(inspector.get_table_names())
+    changes = []
+
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing:
+                table.create(connection)
+                changes.append(f'created table {table.name}')
+                continue
+
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    ddl = str(CreateColumn(column).compile(dialect=engine.dialect))
+                    if column.server_default is None and column.default is not None and column.default.is_scalar:
+                        # Existing rows get the model default, as new rows do
+                        default = db.literal(column.default.arg).compile(
+                            dialect=engine.dialect, compile_kwargs={'literal_binds': True}
+                        )
+                        ddl += f' DEFAULT {default}'
+                    connection.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                    changes.append(f'added column {table.name}.{column.name}')
+
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    changes.append(f'created index {index.name}')
+    return changes
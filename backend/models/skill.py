@@ -0,0 +1,114 @@
+from app import db
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.database import upsert
+import threading
+import weakref
+
+class Skill(db.Model):
+    """Normalized skill dictionary: every distinct skill name gets an integer id"""
+    __tablename__ = 'skills'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    
+    # Per-engine name <-> id caches of committed skills. Ids never change
+    # once committed, so entries stay valid for the life of the engine; each
+    # database (e.g. a new app in tests) gets its own.
+    _caches = weakref.WeakKeyDictionary()
+    _cache_lock = threading.Lock()
+    
+    @classmethod
+    def _cache(cls, engine=None):
+        """``(ids_by_name, names_by_id)`` of the skills committed in ``engine``'s database"""
+        engine = engine or db.engine
+        cache = cls._caches.get(engine)
+        if cache is None:
+            with cls._cache_lock:
+                cache = cls._caches.setdefault(engine, ({}, {}))
+        return cache
+    
+    @classmethod
+    def _remember(cls, pairs):
+        """Cache ``(name, id)`` pairs, or hold them on the session until it commits.
+        
+        Once a transaction has created skills, every pair it reads may be one
+        of its own uncommitted rows, which a rollback would take back.
+        """
+        pending = db.session.info.get('created_skills')
+        if pending is not None:
+            pending.update(pairs)
+            return
+        cls._cache_pairs(db.engine, pairs)
+    
+    @classmethod
+    def _cache_pairs(cls, engine, pairs):
+        ids_by_name, names_by_id = cls._cache(engine)
+        with cls._cache_lock:
+            for name, skill_id in pairs:
+                ids_by_name[name] = skill_id
+                names_by_id[skill_id] = name
+    
+    @classmethod
+    def ids_for(cls, names, create=False):
+        """Map skill names to ids, in input order, optionally creating new skills.
+        
+        Unknown names are dropped unless ``create`` is set.
+        """
+        names = list(dict.fromkeys(names))
+        pending = db.session.info.get('created_skills') or {}
+        ids_by_name = cls._cache()[0]
+        ids = {name: ids_by_name.get(name, pending.get(name)) for name in names}
+        missing = [name for name, skill_id in ids.items() if skill_id is None]
+        if missing:
+            rows = db.session.query(cls.name, cls.id).filter(cls.name.in_(missing)).all()
+            cls._remember(rows)
+            ids.update(rows)
+            missing = [name for name in missing if ids[name] is None]
+        if missing and create:
+            # Inserted in the caller's transaction; names created concurrently
+            # by another worker are skipped
+            upsert(db.session.connection(), cls.__table__, [{'name': name} for name in missing], ['name'],
+                   update_columns=[])
+            db.session.info.setdefault('created_skills', {})
+            rows = db.session.query(cls.name, cls.id).filter(cls.name.in_(missing)).all()
+            cls._remember(rows)
+            ids.update(rows)
+        return [ids[name] for name in names if ids[name] is not None]
+    
+    @classmethod
+    def id_map(cls, names):
+        """``{name: id}`` for the given names, creating unknown skills"""
+        names = list(dict.fromkeys(names))
+        return dict(zip(names, cls.ids_for(names, create=True)))
+    
+    @classmethod
+    def names_for(cls, ids):
+        """Map skill ids back to names"""
+        pending = {skill_id: name for name, skill_id in (db.session.info.get('created_skills') or {}).items()}
+        names_by_id = cls._cache()[1]
+        names = {skill_id: names_by_id.get(skill_id, pending.get(skill_id)) for skill_id in ids}
+        missing = [skill_id for skill_id, name in names.items() if name is None]
+        if missing:
+            rows = db.session.query(cls.name, cls.id).filter(cls.id.in_(missing)).all()
+            cls._remember(rows)
+            names.update((skill_id, name) for name, skill_id in rows)
+        return [names[skill_id] for skill_id in ids if names[skill_id] is not None]
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_created_skills(session):
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop('created_skills', None)
+    if pending:
+        Skill._cache_pairs(session.get_bind(Skill.__mapper__), pending.items())
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_created_skills(session, previous_transaction):
+    if previous_transaction.nested:
+        # Rows from before the savepoint remain; ids are read again
+        if 'created_skills' in session.info:
+            session.info['created_skills'] = {}
+    else:
+        session.info.pop('created_skills', None)
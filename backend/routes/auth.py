@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from models.user import User
 from app import db
 
@@ -12,17 +13,19 @@ def register():
     if not data or not data.get('email') or not data.get('password'):
         return jsonify({'error': 'Email and password are required'}), 400
     
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 400
-    
     user = User(
         email=data['email'],
         name=data.get('name', '')
     )
     user.set_password(data['password'])
     
+    # The unique index on email rejects duplicates; no lookup beforehand
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Email already registered'}), 400
     
     access_token = create_access_token(identity=user.id)
     
@@ -1,23 +1,54 @@
-from flask import Blueprint, request, jsonify
+from itertools import islice
+from flask import Blueprint, Response, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import load_only, selectinload
 from models.job import Job
 from models.resume import Resume
-from services.job_matcher import JobMatcher
+from services.job_import import JobImporter, detect_format, iter_job_records
+from services.shared import get_job_matcher, get_match_cache, get_candidate_index, get_job_json_cache, get_skill_extractor
+from utils.pagination import keyset_page, parse_fields
+from utils.serialization import encode, json_response, model_json, stream_json_list
 from app import db
 
 jobs_bp = Blueprint('jobs', __name__)
 
+def _job_json(job, catalog_version, fields=None):
+    """Serialized job, reused until the job catalogue changes"""
+    return get_job_json_cache().get(
+        (job.id, catalog_version, tuple(fields or ())),
+        lambda: model_json(job, fields)
+    )
+
 @jobs_bp.route('/list', methods=['GET'])
 def list_jobs():
-    jobs = Job.query.filter_by(is_active=True).order_by(Job.created_at.desc()).all()
-    return jsonify({'jobs': [job.to_dict() for job in jobs]}), 200
+    limit = request.args.get('limit', current_app.config['LIST_DEFAULT_LIMIT'], type=int)
+    limit = max(1, min(limit, current_app.config['LIST_MAX_LIMIT']))
+    
+    # Read before the jobs, so a concurrent change can at worst cache the
+    # new JSON under the old version, never the other way round
+    catalog_version = Job.catalog_version()
+    try:
+        fields = parse_fields(request.args.get('fields'), Job)
+        jobs, next_cursor = keyset_page(
+            Job.query.filter_by(is_active=True), Job,
+            cursor=request.args.get('cursor'), limit=limit, fields=fields
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return stream_json_list(
+        'jobs', (_job_json(job, catalog_version, fields) for job in jobs),
+        next_cursor=next_cursor
+    )
 
 @jobs_bp.route('/<int:job_id>', methods=['GET'])
 def get_job(job_id):
+    # Read before the job, as in list_jobs
+    catalog_version = Job.catalog_version()
     job = Job.query.get(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
-    return jsonify({'job': job.to_dict()}), 200
+    return json_response({'job': _job_json(job, catalog_version)})
 
 @jobs_bp.route('/match/<int:resume_id>', methods=['GET'])
 @jwt_required()
@@ -28,24 +59,118 @@ def match_jobs(resume_id):
     if not resume:
         return jsonify({'error': 'Resume not found'}), 404
     
-    jobs = Job.query.filter_by(is_active=True).all()
-    matcher = JobMatcher()
+    if resume.status != 'completed':
+        # Pending and failed resumes have no analysis to match on yet
+        return jsonify({'error': 'Resume analysis is not complete', 'status': resume.status}), 409
+    
+    limit = request.args.get('limit', current_app.config['MATCH_DEFAULT_LIMIT'], type=int)
+    limit = max(0, min(limit, current_app.config['MATCH_MAX_LIMIT']))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    min_score = request.args.get('min_score', 0, type=int)
+    
+    cache = get_match_cache()
+    catalog_version = Job.catalog_version()
+    cache_key = cache.make_key(resume, catalog_version, limit, offset, min_score)
+    cached = cache.get(cache_key)
+    # Entries are serialized response bodies (older entries were dicts)
+    if isinstance(cached, str):
+        return Response(cached, mimetype='application/json')
+    
+    # Only jobs sharing a skill with the resume can score above the
+    # experience component, so read those (and skill-less jobs) from the index.
+    # Scoring needs just the skill ids and the experience column.
+    jobs = Job.query_for_skills(resume.get_skill_ids()).options(
+        load_only(Job.id, Job.experience_required),
+        selectinload(Job.skill_entries)
+    ).all()
+    matcher = get_job_matcher()
+    
+    scores = matcher.score_matrix([resume], jobs)['match_scores'][0].tolist() if jobs else []
+    scored = [
+        {'job_id': job.id, 'match_score': score}
+        for job, score in zip(jobs, scores)
+        if score >= min_score
+    ]
+    page = matcher.rank_jobs(scored, limit=offset + limit)[offset:]
+    
+    # Load and serialize the full job only for the returned page
+    page_jobs = {job.id: job for job in Job.query.filter(Job.id.in_([item['job_id'] for item in page]))}
     
     matches = []
-    for job in jobs:
+    for item in page:
+        job = page_jobs[item['job_id']]
         match_result = matcher.calculate_match(resume, job)
         matches.append({
-            'job': job.to_dict(),
+            'job': _job_json(job, catalog_version),
             'match_score': match_result['match_score'],
             'matching_skills': match_result['matching_skills'],
             'missing_skills': match_result['missing_skills'],
             'experience_match': match_result['experience_match']
         })
     
-    # Sort by match score
-    matches.sort(key=lambda x: x['match_score'], reverse=True)
+    body = encode({
+        'matches': matches,
+        'total': len(scored),
+        'limit': limit,
+        'offset': offset
+    })
+    cache.set(cache_key, body.decode('utf-8'))
+    
+    return Response(body, mimetype='application/json')
+
+@jobs_bp.route('/match/cache-stats', methods=['GET'])
+@jwt_required()
+def match_cache_stats():
+    return jsonify({'cache': get_match_cache().stats()}), 200
+
+@jobs_bp.route('/<int:job_id>/candidates', methods=['GET'])
+@jwt_required()
+def job_candidates(job_id):
+    user_id = get_jwt_identity()
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    limit = request.args.get('limit', current_app.config['CANDIDATE_DEFAULT_LIMIT'], type=int)
+    limit = max(0, min(limit, current_app.config['CANDIDATE_MAX_LIMIT']))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    min_score = request.args.get('min_score', 0, type=int)
+    try:
+        fields = parse_fields(request.args.get('fields'), Resume)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # The caller's analyzed resumes are scored in memory; only the page is read back
+    index = get_candidate_index()
+    index.refresh()
+    total, page = index.search(
+        job.get_skill_ids(),
+        get_job_matcher()._extract_years(job.experience_required),
+        limit=limit,
+        offset=offset,
+        min_score=min_score,
+        user_id=user_id
+    )
+    
+    query = Resume.query.filter(Resume.user_id == user_id, Resume.id.in_([resume_id for resume_id, _ in page]))
+    if fields:
+        columns = {'id'}.union(*(Resume.api_fields[field][0] for field in fields))
+        query = query.options(load_only(*[getattr(Resume, column) for column in sorted(columns)]))
+    resumes = {resume.id: resume for resume in query}
     
-    return jsonify({'matches': matches}), 200
+    candidates = [
+        {'resume': model_json(resumes[resume_id], fields), 'match_score': score}
+        for resume_id, score in page
+        if resume_id in resumes
+    ]
+    
+    return json_response({
+        'job_id': job.id,
+        'candidates': candidates,
+        'total': total,
+        'limit': limit,
+        'offset': offset
+    })
 
 @jobs_bp.route('/create', methods=['POST'])
 @jwt_required()
@@ -66,7 +191,8 @@ def create_job():
         experience_required=data.get('experience_required', ''),
         education_required=data.get('education_required', '')
     )
-    job.set_required_skills(data['required_skills'])
+    # Same spelling as the skills found in resumes, so that they match
+    job.set_required_skills(get_skill_extractor().normalize_skills(data['required_skills']))
     
     db.session.add(job)
     db.session.commit()
@@ -74,4 +200,34 @@ def create_job():
     return jsonify({
         'message': 'Job created successfully',
         'job': job.to_dict()
-    }), 201
\ No newline at end of file
+    }), 201
+
+@jobs_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_jobs():
+    """Bulk import jobs from NDJSON or CSV, sent as the body or as a 'file' upload.
+    
+    Meant for small batches: larger files are rejected before anything is
+    written. Nightly catalogue syncs run with the `flask import-jobs` command.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, file_format = upload.stream, detect_format(upload.filename, upload.mimetype)
+    else:
+        stream, file_format = request.stream, detect_format(mimetype=request.mimetype)
+    file_format = request.args.get('format', file_format)
+    if file_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'Unknown format. Send CSV or NDJSON, or set ?format=csv|ndjson'}), 400
+    
+    config = current_app.config
+    rows = iter_job_records(stream, file_format)
+    head = list(islice(rows, config['JOB_IMPORT_MAX_ROWS'] + 1))
+    if len(head) > config['JOB_IMPORT_MAX_ROWS']:
+        return jsonify({
+            'error': f"At most {config['JOB_IMPORT_MAX_ROWS']} rows per request; use `flask import-jobs` for larger files"
+        }), 413
+    
+    importer = JobImporter(get_skill_extractor(), batch_size=config['JOB_IMPORT_BATCH_SIZE'])
+    summary = importer.import_jobs(head, max_errors=config['JOB_IMPORT_MAX_ERRORS'])
+    
+    return jsonify({'message': 'Jobs imported', **summary}), 201
@@ -1,10 +1,23 @@
-from flask import Blueprint, request, jsonify
+import io
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-from models.resume import Resume
-from services.resume_parser import ResumeParser
+from models.resume import DocumentText, Resume, ResumeAnalysis
+from services.shared import (
+    get_resume_parser, get_skill_extractor, get_analysis_cache, get_analysis_queue, get_storage,
+    get_analysis_pool, discard_analysis_pool
+)
+from services.analysis_cache import content_hash
+from services.analysis_worker import extract_document_text
+from services.bulk_ingest import BulkIngestor, iter_zip_documents, zip_document_sizes
+from services.metrics import stage_timer
+from utils.helpers import storage_key
+from utils.pagination import keyset_page, parse_fields
+from utils.serialization import model_json, stream_json_list
 from app import db
-import os
 
 resume_bp = Blueprint('resume', __name__)
 
@@ -13,10 +26,88 @@ ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def _async_requested():
+    default = 'true' if current_app.config['ANALYSIS_ASYNC'] else 'false'
+    return request.args.get('async', default).lower() in ('1', 'true', 'yes')
+
+def _stream_size(stream):
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(0)
+    return size
+
+def _extract_text(data):
+    """Extract the text of an upload.
+    
+    PDFs are parsed in the analysis pool, where the PDF time limit can
+    interrupt a pathological page; request threads cannot enforce it.
+    """
+    parser = get_resume_parser()
+    if parser.detect_format(bytes(data[:8])) != 'pdf':
+        return parser.extract_text(data)
+    try:
+        # The worker's own stage timings stay in its process; record the
+        # round trip here
+        with stage_timer('extract.pdf'):
+            return get_analysis_pool().submit(extract_document_text, data).result()
+    except BrokenProcessPool:
+        discard_analysis_pool()
+        raise
+
+def _save_resume(resume, data):
+    """Commit a new resume row, storing its file before the commit.
+    
+    The file is written after the row is flushed: the flush bumps the
+    resumes catalogue version, whose row stays locked until the commit.
+    _delete_resumes holds the same lock while it checks and removes
+    files, so it either sees this row or has removed the file already,
+    in which case put() writes it again.
+    """
+    db.session.add(resume)
+    db.session.flush()
+    if resume.file_path:
+        get_storage().put(resume.file_path, data)
+    db.session.commit()
+
+def _create_resume(user_id, filename, filepath, analysis, digest, data=None):
+    # The text itself was stored under the digest by the analysis cache
+    resume = Resume(
+        user_id=user_id,
+        filename=filename,
+        file_path=filepath,
+        content_hash=digest
+    )
+    resume.apply_analysis(analysis, get_analysis_cache().versions)
+    
+    _save_resume(resume, data)
+    return resume
+
+def _enqueue_resume(user_id, filename, filepath, text, digest, data=None):
+    """Store a pending resume and hand it to the background analysis queue"""
+    resume = Resume(
+        user_id=user_id,
+        filename=filename,
+        file_path=filepath,
+        content_hash=digest,
+        status='pending'
+    )
+    if text is not None:
+        # Pasted text has no file for the worker to parse
+        DocumentText.store(digest, text)
+    _save_resume(resume, data)
+    get_analysis_queue().notify()
+    
+    return jsonify({
+        'message': 'Resume accepted for analysis',
+        'job_id': resume.id,
+        'status': resume.status,
+        'resume': resume.to_dict()
+    }), 202
+
 @resume_bp.route('/upload', methods=['POST'])
 @jwt_required()
 def upload_resume():
     user_id = get_jwt_identity()
+    cache = get_analysis_cache()
     
     # Check if file or text is provided
     if 'file' in request.files:
@@ -28,41 +119,39 @@ def upload_resume():
             return jsonify({'error': 'File type not allowed. Use txt, pdf, or docx'}), 400
         
         filename = secure_filename(file.filename)
-        filepath = os.path.join('uploads', f"{user_id}_{filename}")
-        file.save(filepath)
+        data = file.read()
+        digest = content_hash(data)
+        text = None
         
-        # Parse the file
-        parser = ResumeParser()
-        text = parser.extract_text_from_file(filepath)
+        # The background queue parses from storage; otherwise keeping the
+        # original is optional
+        keep_file = current_app.config['STORE_UPLOADS'] or _async_requested()
+        filepath = storage_key(digest, filename) if keep_file else None
         
     elif request.get_json() and request.get_json().get('text'):
         text = request.get_json().get('text')
         filename = 'pasted_resume.txt'
         filepath = None
+        data = None
+        digest = content_hash(text)
     else:
         return jsonify({'error': 'No file or text provided'}), 400
     
-    # Analyze the resume
-    parser = ResumeParser()
-    analysis = parser.analyze_resume(text)
+    # Identical content analyzed before is answered from the cache
+    cached = cache.get(digest)
+    if cached is None and _async_requested():
+        return _enqueue_resume(user_id, filename, filepath, text, digest, data)
     
-    # Save to database
-    resume = Resume(
-        user_id=user_id,
-        filename=filename,
-        file_path=filepath,
-        raw_text=text,
-        experience_years=analysis['experience_years'],
-        education=analysis['education'],
-        ats_score=analysis['ats_score'],
-        word_count=analysis['word_count'],
-        has_email=analysis['has_email'],
-        has_phone=analysis['has_phone']
-    )
-    resume.set_skills(analysis['skills'])
+    if cached is not None:
+        analysis = cached
+    elif data is not None:
+        # Parse straight from the uploaded bytes, no disk round trip
+        analysis = cache.analyze_new(digest, lambda: _extract_text(data))
+    else:
+        analysis = cache.analyze_new(digest, lambda: text)
     
-    db.session.add(resume)
-    db.session.commit()
+    # Save to database
+    resume = _create_resume(user_id, filename, filepath, analysis, digest, data)
     
     return jsonify({
         'message': 'Resume uploaded and analyzed successfully',
@@ -80,27 +169,18 @@ def analyze_resume_text():
         return jsonify({'error': 'Resume text is required'}), 400
     
     text = data['text']
+    digest = content_hash(text)
+    cache = get_analysis_cache()
+    
+    cached = cache.get(digest)
+    if cached is None and _async_requested():
+        return _enqueue_resume(user_id, 'pasted_resume.txt', None, text, digest)
     
     # Analyze the resume
-    parser = ResumeParser()
-    analysis = parser.analyze_resume(text)
+    analysis = cached if cached is not None else cache.analyze_new(digest, lambda: text)
     
     # Save to database
-    resume = Resume(
-        user_id=user_id,
-        filename='pasted_resume.txt',
-        raw_text=text,
-        experience_years=analysis['experience_years'],
-        education=analysis['education'],
-        ats_score=analysis['ats_score'],
-        word_count=analysis['word_count'],
-        has_email=analysis['has_email'],
-        has_phone=analysis['has_phone']
-    )
-    resume.set_skills(analysis['skills'])
-    
-    db.session.add(resume)
-    db.session.commit()
+    resume = _create_resume(user_id, 'pasted_resume.txt', None, analysis, digest)
     
     return jsonify({
         'message': 'Resume analyzed successfully',
@@ -108,15 +188,133 @@ def analyze_resume_text():
         'analysis': analysis
     }), 201
 
+@resume_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_upload_resumes():
+    user_id = get_jwt_identity()
+    files = request.files.getlist('files')
+    
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    config = current_app.config
+    
+    # Sized up front, from the zip directories, so a small archive cannot
+    # expand into more than the limits allow
+    sizes = []
+    try:
+        for file in files:
+            if file.filename.lower().endswith('.zip'):
+                sizes += zip_document_sizes(file.stream, ALLOWED_EXTENSIONS, config['MAX_CONTENT_LENGTH'])
+                file.stream.seek(0)
+            elif allowed_file(file.filename):
+                sizes.append(_stream_size(file.stream))
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Invalid zip archive'}), 400
+    if len(sizes) > config['BULK_MAX_DOCUMENTS'] or sum(sizes) > config['BULK_MAX_TOTAL_BYTES']:
+        return jsonify({
+            'error': f"A bulk upload takes at most {config['BULK_MAX_DOCUMENTS']} documents "
+                     f"and {config['BULK_MAX_TOTAL_BYTES'] // (1024 * 1024)} MB uncompressed"
+        }), 413
+    
+    def documents():
+        for file in files:
+            if file.filename.lower().endswith('.zip'):
+                yield from iter_zip_documents(file.stream, ALLOWED_EXTENSIONS, current_app.config['MAX_CONTENT_LENGTH'])
+            elif allowed_file(file.filename):
+                yield secure_filename(file.filename), file.read()
+    
+    documents = documents()
+    
+    # Unless the client asks otherwise, uploads too large to parse within
+    # the request go to the background queue
+    head = list(islice(documents, config['BULK_SYNC_MAX_DOCUMENTS'] + 1))
+    if 'async' in request.args:
+        enqueue = _async_requested()
+    else:
+        enqueue = config['ANALYSIS_ASYNC'] or len(head) > config['BULK_SYNC_MAX_DOCUMENTS']
+    
+    ingestor = BulkIngestor(
+        get_storage(),
+        get_analysis_cache(),
+        workers=config['ANALYSIS_WORKERS'],
+        batch_size=config['BULK_BATCH_SIZE'],
+        executor=None if enqueue else get_analysis_pool()
+    )
+    try:
+        summary = ingestor.ingest(user_id, chain(head, documents), enqueue=enqueue)
+    except BrokenProcessPool:
+        discard_analysis_pool()
+        raise
+    
+    if enqueue:
+        get_analysis_queue().notify()
+        return jsonify({'message': 'Resumes accepted for analysis', **summary}), 202
+    
+    return jsonify({'message': 'Resumes ingested', **summary}), 201
+
+@resume_bp.route('/<int:resume_id>/status', methods=['GET'])
+@jwt_required()
+def get_resume_status(resume_id):
+    user_id = get_jwt_identity()
+    resume = Resume.query.filter_by(id=resume_id, user_id=user_id).first()
+    
+    if not resume:
+        return jsonify({'error': 'Resume not found'}), 404
+    
+    result = {'job_id': resume.id, 'status': resume.status}
+    if resume.status in ('pending', 'processing'):
+        # Make sure rows left over from a restart get picked up
+        get_analysis_queue().start()
+    elif resume.status == 'failed':
+        result['error'] = resume.analysis_error
+    else:
+        result['resume'] = resume.to_dict()
+        analysis = get_analysis_cache().get(resume.content_hash) if resume.content_hash else None
+        if analysis is not None:
+            result['analysis'] = analysis
+    
+    return jsonify(result), 200
+
 @resume_bp.route('/list', methods=['GET'])
 @jwt_required()
 def list_resumes():
     user_id = get_jwt_identity()
-    resumes = Resume.query.filter_by(user_id=user_id).order_by(Resume.created_at.desc()).all()
+    limit = request.args.get('limit', current_app.config['LIST_DEFAULT_LIMIT'], type=int)
+    limit = max(1, min(limit, current_app.config['LIST_MAX_LIMIT']))
     
-    return jsonify({
-        'resumes': [resume.to_dict() for resume in resumes]
-    }), 200
+    try:
+        fields = parse_fields(request.args.get('fields'), Resume)
+        resumes, next_cursor = keyset_page(
+            Resume.query.filter_by(user_id=user_id), Resume,
+            cursor=request.args.get('cursor'), limit=limit, fields=fields
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return stream_json_list(
+        'resumes', (model_json(resume, fields) for resume in resumes),
+        next_cursor=next_cursor
+    )
+
+@resume_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_resumes():
+    user_id = get_jwt_identity()
+    skill = request.args.get('skill')
+    
+    if not skill:
+        return jsonify({'error': 'Skill is required'}), 400
+    
+    # Spelled as in job postings (e.g. "Postgres" or "Python 3"); names
+    # that expand to several skills find resumes having all of them
+    skills = get_skill_extractor().normalize_skills([skill])
+    
+    # Unbounded, so rows are read in chunks while the response streams
+    resumes = Resume.query_with_skills(skills).filter_by(user_id=user_id) \
+        .order_by(Resume.created_at.desc(), Resume.id.desc()).yield_per(500)
+    
+    return stream_json_list('resumes', (model_json(resume) for resume in resumes))
 
 @resume_bp.route('/<int:resume_id>', methods=['GET'])
 @jwt_required()
@@ -129,6 +327,28 @@ def get_resume(resume_id):
     
     return jsonify({'resume': resume.to_dict()}), 200
 
+def _delete_resumes(resumes):
+    """Delete resume rows, and every stored file, text and analysis no remaining resume shares"""
+    keys = {resume.file_path for resume in resumes if resume.file_path}
+    digests = {resume.content_hash for resume in resumes if resume.content_hash}
+    
+    for resume in resumes:
+        db.session.delete(resume)
+    # The flush locks the resumes catalogue version until the commit, so no
+    # upload can commit a row for the same content while we check and remove
+    # (see _save_resume)
+    db.session.flush()
+    
+    if digests:
+        for model in (ResumeAnalysis, DocumentText):
+            unused = ~db.session.query(Resume.id).filter(Resume.content_hash == model.content_hash).exists()
+            model.query.filter(model.content_hash.in_(digests), unused).delete(synchronize_session=False)
+    if keys:
+        still_used = db.session.query(Resume.file_path).filter(Resume.file_path.in_(keys))
+        keys -= {key for (key,) in still_used}
+    get_storage().delete_many(sorted(keys))
+    db.session.commit()
+
 @resume_bp.route('/<int:resume_id>', methods=['DELETE'])
 @jwt_required()
 def delete_resume(resume_id):
@@ -138,11 +358,23 @@ def delete_resume(resume_id):
     if not resume:
         return jsonify({'error': 'Resume not found'}), 404
     
-    # Delete file if exists
-    if resume.file_path and os.path.exists(resume.file_path):
-        os.remove(resume.file_path)
+    _delete_resumes([resume])
     
-    db.session.delete(resume)
-    db.session.commit()
+    return jsonify({'message': 'Resume deleted successfully'}), 200
+
+@resume_bp.route('/delete', methods=['POST'])
+@jwt_required()
+def bulk_delete_resumes():
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('ids'), list):
+        return jsonify({'error': 'A list of resume ids is required'}), 400
+    
+    resumes = Resume.query.filter(Resume.user_id == user_id, Resume.id.in_(data['ids'])).all()
+    _delete_resumes(resumes)
     
-    return jsonify({'message': 'Resume deleted successfully'}), 200
\ No newline at end of file
+    return jsonify({
+        'message': 'Resumes deleted successfully',
+        'deleted': [resume.id for resume in resumes]
+    }), 200
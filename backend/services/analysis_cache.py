@@ -0,0 +1,76 @@
+import hashlib
+import threading
+from app import db
+from models.resume import ResumeAnalysis
+
+
+def content_hash(data):
+    """SHA-256 hex digest of uploaded bytes (or text, encoded as UTF-8)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisCache:
+    """Content-addressed cache in front of ResumeParser.
+
+    Documents are keyed by the hash of their content, so an identical upload
+    reuses the stored analysis instead of being parsed again. An
+    entry made with older analysis rules is brought up to date on read by
+    rerunning only its stale stages on the stored text.
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def versions(self):
+        """Stage versions of the analyses this cache returns"""
+        return self.parser.stage_versions()
+
+    def get(self, digest):
+        row = db.session.get(ResumeAnalysis, digest)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        analysis = row.get_analysis()
+        versions = row.get_analysis_versions()
+        if versions != self.versions:
+            # The stored text is only read here, to rerun the stale stages
+            analysis, _ = self.parser.reanalyze_resume(row.raw_text, analysis, versions)
+            row.set_analysis(analysis, self.versions)
+        return analysis
+
+    def analyze_new(self, digest, load_text):
+        """Analyze and store a document that get() did not find.
+
+        ``load_text`` is called to extract the text, which is stored
+        alongside the analysis. The lookup is left to the caller, so each
+        request counts as one hit or one miss.
+        """
+        text = load_text()
+        analysis = self.parser.analyze_resume(text)
+        self.store(digest, text, analysis)
+        return analysis
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def store(self, digest, text, analysis):
+        # Skipped if a concurrent request stored the same document first
+        ResumeAnalysis.bulk_store([
+            {'content_hash': digest, 'raw_text': text, 'analysis': analysis, 'analysis_versions': self.versions}
+        ])
@@ -0,0 +1,95 @@
+import hashlib
+from collections import namedtuple
+from services.metrics import stage_timer
+
+Stage = namedtuple('Stage', ['name', 'func', 'version', 'depends_on'], defaults=(1, ()))
+
+
+class AnalysisContext:
+    """Per-document state shared by the analysis stages.
+
+    The lowercased text and the token list are computed on first use and then
+    reused by every stage; stage outputs are collected in ``results``.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.results = {}
+        self._text_lower = None
+        self._tokens = None
+
+    @property
+    def text_lower(self):
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+
+
+class AnalysisPipeline:
+    """Ordered list of named stages run once per document.
+
+    A stage is a callable taking an ``AnalysisContext`` and returning a value,
+    which is stored in ``context.results`` under the stage name. Later stages
+    read earlier results from the context instead of recomputing them.
+
+    Each stage carries a rule version and the names of the stages it reads.
+    Bumping a version (or changing a dependency's) marks the stage as stale
+    in ``stale_stages``, so stored analyses can be refreshed stage by stage.
+    """
+
+    def __init__(self, stages=None):
+        self.stages = [Stage(*stage) for stage in stages or []]
+
+    def add_stage(self, name, func, before=None, version=1, depends_on=()):
+        """Register a stage, appended or inserted before an existing one"""
+        if name in self.stage_names():
+            raise ValueError(f'Stage already registered: {name}')
+        stage = Stage(name, func, version, tuple(depends_on))
+        if before is None:
+            self.stages.append(stage)
+        else:
+            self.stages.insert(self.stage_names().index(before), stage)
+
+    def stage_names(self):
+        return [stage.name for stage in self.stages]
+
+    def stage_versions(self):
+        """Effective version of every stage: its own plus those of its inputs"""
+        versions = {}
+        for stage in self.stages:
+            parts = [f'{stage.name}={stage.version}']
+            parts.extend(versions[dependency] for dependency in sorted(stage.depends_on))
+            versions[stage.name] = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+        return versions
+
+    def stale_stages(self, versions):
+        """Names of the stages whose effective version differs from ``versions``"""
+        versions = versions or {}
+        return [name for name, version in self.stage_versions().items() if versions.get(name) != version]
+
+    def run(self, text, results=None, only=None):
+        """Run the stages on the text and return the context.
+
+        With ``only``, the listed stages are run on top of the earlier
+        ``results``, plus any stage they read whose result is missing.
+        """
+        context = AnalysisContext(text)
+        context.results.update(results or {})
+        if only is None:
+            needed = set(self.stage_names())
+        else:
+            needed = set(only)
+            for stage in reversed(self.stages):
+                if stage.name in needed:
+                    needed.update(name for name in stage.depends_on if name not in context.results)
+        for stage in self.stages:
+            if stage.name in needed:
+                with stage_timer(f'analyze.{stage.name}'):
+                    context.results[stage.name] = stage.func(context)
+        return context
@@ -0,0 +1,148 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from app import db
+from models.resume import Resume
+from services.analysis_worker import ANALYSIS_FAILED, analyze_document, init_worker
+
+
+class AnalysisQueue:
+    """Runs pending resume analyses on a local process pool.
+
+    The queue is the ``resumes`` table itself: rows with status ``pending``
+    are claimed by a dispatcher thread, analyzed in a worker process and
+    written back as ``completed`` or ``failed``. No broker is needed, several
+    web processes can share the table, and rows left ``processing`` by a
+    crashed process are picked up again once they go stale.
+    """
+
+    def __init__(self, app, analysis_cache, max_workers=None, poll_interval=1.0,
+                 stale_after=600, start_method='spawn', worker_config=None):
+        self.app = app
+        self.analysis_cache = analysis_cache
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.poll_interval = poll_interval
+        self.stale_after = timedelta(seconds=stale_after)
+        self.start_method = start_method
+        # Settings for the worker processes (see analysis_worker.worker_config)
+        self.worker_config = worker_config
+        self._in_flight = {}
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = None
+        self._last_reclaim = None
+
+    def start(self):
+        """Start the dispatcher thread and worker pool (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._executor = self._create_executor()
+            self._thread = threading.Thread(target=self._run, name='analysis-queue', daemon=True)
+            self._thread.start()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=init_worker,
+            initargs=(self.worker_config,)
+        )
+
+    def notify(self):
+        """Wake the dispatcher after new rows were enqueued"""
+        self.start()
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self._claim()
+            except Exception:
+                self.app.logger.exception('Analysis queue dispatch failed')
+
+            if not self._in_flight:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            done, _ = wait(list(self._in_flight), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                resume_id = self._in_flight.pop(future)
+                try:
+                    with self.app.app_context():
+                        self._finish(resume_id, future)
+                except Exception:
+                    self.app.logger.exception('Could not store analysis of resume %s', resume_id)
+
+    def _claim(self):
+        """Move pending rows to processing and submit them to the pool"""
+        self._reclaim_stale()
+
+        free_slots = self.max_workers * 2 - len(self._in_flight)
+        if free_slots <= 0:
+            return
+
+        candidates = Resume.query.with_entities(Resume.id).filter_by(status='pending') \
+            .order_by(Resume.id).limit(free_slots).all()
+        for (resume_id,) in candidates:
+            # The conditional update only succeeds for one claimant
+            claimed = Resume.query.filter_by(id=resume_id, status='pending') \
+                .update({'status': 'processing'}, synchronize_session=False)
+            db.session.commit()
+            if not claimed:
+                continue
+
+            resume = db.session.get(Resume, resume_id)
+            text = None if resume.file_path else resume.raw_text
+            try:
+                future = self._executor.submit(analyze_document, resume.file_path, text)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed while parsing); replace the pool
+                self._executor = self._create_executor()
+                future = self._executor.submit(analyze_document, resume.file_path, text)
+            self._in_flight[future] = resume_id
+
+    def _reclaim_stale(self):
+        """Put rows left processing by a crashed process back to pending.
+
+        Runs once per ``stale_after`` and only writes when there are such
+        rows, so idle dispatchers in every web process do not contend for
+        the database write lock.
+        """
+        now = datetime.utcnow()
+        if self._last_reclaim is not None and now - self._last_reclaim < self.stale_after:
+            return
+        self._last_reclaim = now
+
+        stale = Resume.query.filter(Resume.status == 'processing', Resume.updated_at < now - self.stale_after)
+        if not db.session.query(stale.exists()).scalar():
+            return
+        stale.update({'status': 'pending'}, synchronize_session=False)
+        db.session.commit()
+
+    def _finish(self, resume_id, future):
+        resume = db.session.get(Resume, resume_id)
+        if resume is None:
+            # Deleted while it was being analyzed
+            return
+
+        try:
+            text, analysis = future.result()
+        except Exception:
+            # The details stay in the log; clients only see the status
+            self.app.logger.exception('Analysis of resume %s failed', resume_id)
+            resume.status = 'failed'
+            resume.analysis_error = ANALYSIS_FAILED
+            db.session.commit()
+            return
+
+        resume.apply_analysis(analysis, self.analysis_cache.versions)
+        if resume.content_hash:
+            # Also stores the text, under the content hash
+            self.analysis_cache.store(resume.content_hash, text, analysis)
+        db.session.commit()
@@ -0,0 +1,107 @@
+import logging
+from config import Config
+from services.resume_parser import ResumeParser
+from services.storage import create_storage
+
+# Worker-process side of the analysis pool. Kept free of Flask and database
+# imports so spawned workers start quickly; each process builds one parser
+# and one storage client from the settings its pool passed to init_worker.
+_config = None
+_parser = None
+_storage = None
+
+# App config keys the workers read
+WORKER_CONFIG_KEYS = (
+    'PDF_MAX_PAGES', 'PDF_TIME_LIMIT', 'SKILL_ENGINE', 'SPACY_MODEL',
+    'STORAGE_BACKEND', 'STORAGE_BUCKET', 'STORAGE_ENDPOINT_URL', 'UPLOAD_FOLDER'
+)
+
+logger = logging.getLogger(__name__)
+
+# Stored on failed rows and shown to clients; the exception is only logged
+ANALYSIS_FAILED = 'The resume could not be analyzed'
+
+def worker_config(config):
+    """The part of an app config the workers need, to pass to init_worker"""
+    return {key: config.get(key) for key in WORKER_CONFIG_KEYS}
+
+def init_worker(config):
+    """Pool initializer: parse and read files with the app's settings"""
+    global _config, _parser, _storage
+    _config = config
+    _parser = None
+    _storage = None
+
+def _get_config():
+    if _config is None:
+        # Not started by a pool of the app; use the defaults
+        return worker_config({key: getattr(Config, key) for key in dir(Config) if key.isupper()})
+    return _config
+
+def _get_parser():
+    global _parser
+    if _parser is None:
+        config = _get_config()
+        _parser = ResumeParser(
+            max_pdf_pages=config['PDF_MAX_PAGES'],
+            pdf_time_limit=config['PDF_TIME_LIMIT'],
+            skill_engine=config['SKILL_ENGINE'],
+            spacy_model=config['SPACY_MODEL']
+        )
+    return _parser
+
+def _get_storage():
+    global _storage
+    if _storage is None:
+        _storage = create_storage(_get_config())
+    return _storage
+
+def analyze_document(key=None, text=None):
+    """Extract (when no text is given) and analyze one stored document.
+
+    Returns ``(text, analysis)``.
+    """
+    parser = _get_parser()
+    if text is None:
+        with _get_storage().open(key) as stream:
+            text = parser.extract_text(stream)
+    return text, parser.analyze_resume(text)
+
+def extract_document_text(data):
+    """Extract the text of an uploaded document"""
+    return _get_parser().extract_text(data)
+
+def try_analyze_document(key):
+    """Like analyze_document, but returns ``(text, analysis, error)`` instead of raising"""
+    try:
+        text, analysis = analyze_document(key)
+    except Exception:
+        logger.exception('Analysis of %s failed', key)
+        return None, None, ANALYSIS_FAILED
+    return text, analysis, None
+
+def try_analyze_documents(keys):
+    """try_analyze_document for many stored documents.
+    
+    The texts are analyzed as one batch, which the spaCy skill engine runs
+    through ``nlp.pipe``.
+    """
+    parser = _get_parser()
+    texts = {}
+    failed = set()
+    for key in keys:
+        try:
+            with _get_storage().open(key) as stream:
+                texts[key] = parser.extract_text(stream)
+        except Exception:
+            logger.exception('Analysis of %s failed', key)
+            failed.add(key)
+    try:
+        analyses = dict(zip(texts, parser.analyze_resumes(texts.values())))
+    except Exception:
+        # Analyze one at a time to confine the failure to its document
+        return [try_analyze_document(key) for key in keys]
+    return [
+        (None, None, ANALYSIS_FAILED) if key in failed else (texts[key], analyses[key], None)
+        for key in keys
+    ]
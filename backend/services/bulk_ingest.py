@@ -0,0 +1,186 @@
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from werkzeug.utils import secure_filename
+from app import db
+from models.resume import Resume, ResumeAnalysis
+from services.analysis_cache import content_hash
+from services.analysis_worker import init_worker, try_analyze_documents
+from utils.helpers import allowed_file, storage_key
+
+
+def _zip_members(archive, allowed_extensions, max_size):
+    for info in archive.infolist():
+        filename = secure_filename(os.path.basename(info.filename))
+        if info.is_dir() or not allowed_file(filename, allowed_extensions):
+            continue
+        if info.file_size > max_size:
+            continue
+        yield filename, info
+
+
+def iter_zip_documents(fileobj, allowed_extensions, max_size):
+    """Yield ``(filename, bytes)`` for every allowed file inside a zip archive"""
+    with zipfile.ZipFile(fileobj) as archive:
+        for filename, info in _zip_members(archive, allowed_extensions, max_size):
+            yield filename, archive.read(info)
+
+
+def zip_document_sizes(fileobj, allowed_extensions, max_size):
+    """Uncompressed sizes of the documents iter_zip_documents would yield.
+
+    Read from the archive's central directory, without decompressing; a
+    member cannot expand beyond its recorded size.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        return [info.file_size for _, info in _zip_members(archive, allowed_extensions, max_size)]
+
+
+def iter_directory_documents(directory, allowed_extensions):
+    """Yield ``(filename, bytes)`` for every allowed file below a directory"""
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if allowed_file(name, allowed_extensions):
+                with open(os.path.join(root, name), 'rb') as file:
+                    yield secure_filename(name), file.read()
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkIngestor:
+    """Ingest many resumes at once.
+
+    Documents are stored content-addressed, parsed and analyzed on a process
+    pool spread over all cores, and written with one commit per batch. Content
+    that was analyzed before is taken from the analysis cache.
+    """
+
+    def __init__(self, storage, analysis_cache, workers=None, batch_size=200, start_method='spawn',
+                 executor=None, worker_config=None):
+        self.storage = storage
+        self.analysis_cache = analysis_cache
+        self.workers = workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.start_method = start_method
+        # A long-lived pool to reuse; without one each ingest starts its own
+        self.executor = executor
+        # Settings for the workers of that own pool (see analysis_worker.worker_config)
+        self.worker_config = worker_config
+
+    def ingest(self, user_id, documents, enqueue=False):
+        """Ingest ``(filename, bytes)`` pairs for a user and return a summary.
+
+        With ``enqueue`` the rows are only stored as pending, for the
+        background analysis queue to pick up.
+        """
+        summary = {'ingested': 0, 'cached': 0, 'failed': []}
+
+        if enqueue:
+            for batch in _batches(documents, self.batch_size):
+                self._enqueue_batch(user_id, batch, summary)
+            return summary
+
+        if self.executor is not None:
+            pool = nullcontext(self.executor)
+        else:
+            context = multiprocessing.get_context(self.start_method)
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                       initializer=init_worker, initargs=(self.worker_config,))
+        with pool as executor:
+            for batch in _batches(documents, self.batch_size):
+                self._ingest_batch(executor, user_id, batch, summary)
+        return summary
+
+    def _keys(self, batch):
+        """``(filename, key, digest)`` of each document"""
+        stored = []
+        for filename, data in batch:
+            digest = content_hash(data)
+            stored.append((filename, storage_key(digest, filename), digest))
+        return stored
+
+    def _store(self, batch, stored):
+        # put() skips files already there, so this can be repeated cheaply
+        for (_, data), (_, key, _) in zip(batch, stored):
+            self.storage.put(key, data)
+
+    def _enqueue_batch(self, user_id, batch, summary):
+        stored = self._keys(batch)
+        Resume.bulk_insert([
+            {'user_id': user_id, 'filename': filename, 'file_path': key,
+             'content_hash': digest, 'status': 'pending'}
+            for filename, key, digest in stored
+        ])
+        # Stored while the insert holds the resumes catalogue lock, as
+        # uploads do, so a concurrent delete cannot remove a shared file
+        self._store(batch, stored)
+        db.session.commit()
+        summary['ingested'] += len(batch)
+
+    def _ingest_batch(self, executor, user_id, batch, summary):
+        stored = self._keys(batch)
+        # The workers parse the stored files
+        self._store(batch, stored)
+
+        # One query loads the known analyses; the cache then reads them from
+        # the session and refreshes any made with older rules
+        digests = {digest for _, _, digest in stored}
+        known = {
+            row.content_hash: self.analysis_cache.get(row.content_hash)
+            for row in ResumeAnalysis.query.filter(ResumeAnalysis.content_hash.in_(digests))
+        }
+
+        # Parse each unseen document once, even if it repeats within the batch
+        to_parse = {}
+        for _, key, digest in stored:
+            if digest not in known:
+                to_parse.setdefault(digest, key)
+        # Each task analyzes a chunk of documents as one batch
+        keys = list(to_parse.values())
+        chunksize = max(1, len(keys) // (self.workers * 4))
+        chunks = [keys[start:start + chunksize] for start in range(0, len(keys), chunksize)]
+        parsed = dict(zip(
+            to_parse,
+            (result for results in executor.map(try_analyze_documents, chunks) for result in results)
+        ))
+
+        versions = self.analysis_cache.versions
+        ResumeAnalysis.bulk_store([
+            {'content_hash': digest, 'raw_text': text, 'analysis': analysis, 'analysis_versions': versions}
+            for digest, (text, analysis, error) in parsed.items() if error is None
+        ])
+
+        # Resume rows are written with batched inserts rather than one ORM
+        # object (and one skill row flush) each
+        records = []
+        for filename, key, digest in stored:
+            record = {'user_id': user_id, 'filename': filename, 'file_path': key, 'content_hash': digest}
+            if digest in known:
+                analysis = known[digest]
+                summary['cached'] += 1
+            else:
+                _, analysis, error = parsed[digest]
+                if error is not None:
+                    record.update(status='failed', analysis_error=error)
+                    summary['failed'].append({'filename': filename, 'error': error})
+                    records.append(record)
+                    continue
+            record.update(Resume.analysis_columns(analysis, versions), skills=analysis['skills'])
+            records.append(record)
+            summary['ingested'] += 1
+
+        Resume.bulk_insert(records)
+        # Again under the resumes catalogue lock: a delete of a resume with
+        # the same content may have removed a file since it was stored above
+        self._store(batch, stored)
+        db.session.commit()
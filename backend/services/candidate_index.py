@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from app import db
+from models.catalog import CatalogVersion
+from models.resume import Resume, ResumeSkill
+from models.skill import Skill
+from services.metrics import timed
+
+# Popcount of every byte value, for NumPy versions without bitwise_count
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words):
+    """Number of set bits in each row of a uint64 matrix"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+# One immutable build of the index; searches read a single snapshot, so a
+# rebuild can never mix arrays of different builds
+IndexSnapshot = namedtuple('IndexSnapshot', [
+    'resume_ids', 'user_ids', 'experience', 'skill_bits', 'position_by_skill_id', 'version', 'built_at'
+])
+
+
+class CandidateIndex:
+    """In-memory index of every analyzed resume for job -> candidate search.
+
+    Each resume's skills are a fixed-width bitset over the SkillExtractor
+    vocabulary, stored as rows of a uint64 matrix next to arrays of
+    experience years and owners. A search scores the resumes at once with
+    the same 70/30 formula as JobMatcher.calculate_match, using vectorized
+    popcounts. Once the resume catalogue version changes, a new snapshot is
+    built on a background thread, at most once every ``max_staleness``
+    seconds; searches keep using the previous one meanwhile.
+    """
+
+    def __init__(self, app, vocabulary, max_staleness=30):
+        self.app = app
+        self.vocabulary = tuple(vocabulary)
+        self.words = (len(self.vocabulary) + 63) // 64
+        self.max_staleness = max_staleness
+        self._snapshot = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Build the index on first use, later rebuild it in the background if resumes changed"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self.build()
+            return
+        if time.monotonic() - snapshot.built_at < self.max_staleness:
+            # Serve the slightly stale index rather than rebuilding per upload
+            return
+        if CatalogVersion.current('resumes') == snapshot.version:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name='candidate-index', daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            with self.app.app_context():
+                self._snapshot = self.build()
+        except Exception:
+            self.app.logger.exception('Could not rebuild the candidate index')
+        finally:
+            self._rebuilding = False
+
+    @timed('candidates.build')
+    def build(self):
+        """Load every completed resume into a new snapshot"""
+        # Read first, so changes made during the build trigger another one
+        version = CatalogVersion.current('resumes')
+        skill_ids = Skill.ids_for(self.vocabulary)
+        names = Skill.names_for(skill_ids)
+        position = {name: index for index, name in enumerate(self.vocabulary)}
+        position_by_skill_id = {skill_id: position[name] for skill_id, name in zip(skill_ids, names)}
+
+        rows = db.session.query(Resume.id, Resume.user_id, Resume.experience_years) \
+            .filter_by(status='completed').order_by(Resume.id).all()
+        resume_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        user_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        experience = np.fromiter((row[2] or 0 for row in rows), dtype=np.float64, count=len(rows))
+
+        pairs = db.session.query(ResumeSkill.resume_id, ResumeSkill.skill_id) \
+            .join(Resume, Resume.id == ResumeSkill.resume_id) \
+            .filter(Resume.status == 'completed', ResumeSkill.skill_id.in_(list(position_by_skill_id))) \
+            .all()
+        skill_bits = np.zeros((len(rows), self.words), dtype=np.uint64)
+        if pairs:
+            pair_resume_ids = np.array([pair[0] for pair in pairs], dtype=np.int64)
+            positions = np.array([position_by_skill_id[pair[1]] for pair in pairs], dtype=np.int64)
+            row_index = np.searchsorted(resume_ids, pair_resume_ids)
+            # Resumes completed between the two queries wait for the next build
+            loaded = row_index < len(resume_ids)
+            loaded[loaded] = resume_ids[row_index[loaded]] == pair_resume_ids[loaded]
+            row_index, positions = row_index[loaded], positions[loaded]
+            np.bitwise_or.at(
+                skill_bits,
+                (row_index, positions // 64),
+                np.left_shift(np.uint64(1), (positions % 64).astype(np.uint64))
+            )
+
+        for array in (resume_ids, user_ids, experience, skill_bits):
+            array.flags.writeable = False
+        return IndexSnapshot(
+            resume_ids, user_ids, experience, skill_bits, position_by_skill_id, version, time.monotonic()
+        )
+
+    @timed('candidates.search')
+    def search(self, skill_ids, experience_required, limit=20, offset=0, min_score=0, user_id=None):
+        """Return ``(total, [(resume_id, match_score), ...])`` for the best resumes.
+
+        With ``user_id`` only that user's resumes are considered.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return 0, []
+
+        rows = slice(None) if user_id is None else np.flatnonzero(snapshot.user_ids == int(user_id))
+        resume_ids = snapshot.resume_ids[rows]
+
+        skill_ids = set(skill_ids)
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for skill_id in skill_ids:
+            position = snapshot.position_by_skill_id.get(skill_id)
+            if position is not None:
+                mask[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+
+        # Skill matching (70% weight); skills outside the vocabulary can never
+        # match but still count as required, as in calculate_match
+        if skill_ids:
+            overlap = _popcount_rows(snapshot.skill_bits[rows] & mask)
+            skill_match_score = (overlap / len(skill_ids)) * 70
+        else:
+            skill_match_score = np.zeros(len(resume_ids))
+
+        # Experience matching (30% weight)
+        if experience_required > 0:
+            exp_ratio = np.minimum(snapshot.experience[rows] / experience_required, 1.0)
+        else:
+            exp_ratio = np.ones(len(resume_ids))
+        scores = (skill_match_score + exp_ratio * 30).astype(np.int64)
+
+        selected = np.flatnonzero(scores >= min_score)
+        total = len(selected)
+        wanted = offset + limit
+        if wanted < total:
+            # Partial selection keeps this O(n) instead of sorting everything
+            part = np.argpartition(-scores[selected], wanted - 1)[:wanted]
+            selected = selected[part]
+        order = np.lexsort((resume_ids[selected], -scores[selected]))
+        page = selected[order][offset:wanted]
+        return total, list(zip(resume_ids[page].tolist(), scores[page].tolist()))
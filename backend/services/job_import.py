@@ -0,0 +1,197 @@
+import csv
+import io
+import json
+import re
+from itertools import islice
+from app import db
+from models.job import Job
+
+# Job columns an import record may set; anything else is ignored
+IMPORT_FIELDS = (
+    'external_id', 'title', 'company', 'location', 'salary_range', 'description', 'requirements',
+    'required_skills', 'experience_required', 'education_required', 'is_active'
+)
+
+_SKILL_SEPARATORS = re.compile(r'[,;|\n]')
+
+
+def detect_format(filename='', mimetype=''):
+    """'csv' or 'ndjson' from a file name or content type, or None"""
+    filename = (filename or '').lower()
+    if filename.endswith('.csv') or mimetype == 'text/csv':
+        return 'csv'
+    if filename.endswith(('.ndjson', '.jsonl')) or mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    return None
+
+
+def _text_stream(stream):
+    if not hasattr(stream, 'read1'):
+        stream = io.BufferedReader(stream)
+    # utf-8-sig: spreadsheet exports often start with a byte order mark
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def iter_ndjson_records(stream):
+    """Yield ``(line, record, error)`` for each line of a binary NDJSON stream"""
+    for line_number, line in enumerate(_text_stream(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, f'Invalid JSON: {exc}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, record, None
+
+
+def iter_csv_records(stream):
+    """Yield ``(line, record, error)`` for each row of a binary CSV stream with a header row"""
+    reader = csv.DictReader(_text_stream(stream))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # The reader carries on with the next line; the error is not yet
+            # counted in line_num
+            yield reader.line_num + 1, None, f'Invalid CSV: {exc}'
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if key is not None}, None
+
+
+def iter_job_records(stream, file_format):
+    if file_format == 'csv':
+        return iter_csv_records(stream)
+    if file_format == 'ndjson':
+        return iter_ndjson_records(stream)
+    raise ValueError(f'Unknown import format: {file_format}')
+
+
+def _parse_skills(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if isinstance(value, str):
+            return [skill for skill in _SKILL_SEPARATORS.split(value) if skill.strip()]
+    if isinstance(value, list):
+        return [str(skill) for skill in value if skill is not None]
+    raise ValueError('required_skills must be a list or a separated string')
+
+
+def _parse_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('', 'none', 'null'):
+        return None
+    if text in ('1', 'true', 'yes', 'y', 'active'):
+        return True
+    if text in ('0', 'false', 'no', 'n', 'inactive'):
+        return False
+    raise ValueError(f'is_active must be true or false, not {value!r}')
+
+
+def clean_record(record):
+    """Validate one raw import record and return the Job column values"""
+    columns = Job.__table__.columns
+    cleaned = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        if field == 'required_skills':
+            value = _parse_skills(value)
+        elif field == 'is_active':
+            value = _parse_bool(value)
+        elif value is not None:
+            value = str(value).strip() or None
+            length = getattr(columns[field].type, 'length', None)
+            if value is not None and length is not None and len(value) > length:
+                raise ValueError(f'{field} is longer than {length} characters')
+        cleaned[field] = value
+    missing = [field for field in ('title', 'company') if not cleaned[field]]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    return cleaned
+
+
+class JobImporter:
+    """Import job postings in batches.
+
+    Records are consumed lazily from the parsed input. Each batch has its
+    skills normalized against the skill vocabulary in one pass, with skills
+    extracted from the description and requirements of records that list
+    none, and is written with Job.bulk_write and one commit. That bumps the
+    job catalogue version once per batch, which retires the cached matches
+    and job JSON. Records with an ``external_id`` replace the job imported
+    under it before, so a nightly sync updates postings in place.
+    """
+
+    def __init__(self, skill_extractor, batch_size=1000):
+        self.skill_extractor = skill_extractor
+        self.batch_size = batch_size
+
+    def run(self, rows):
+        """Import ``(line, record, error)`` triples, yielding a summary after each batch"""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+
+            errors = []
+            by_key = {}
+            for line, record, error in batch:
+                if error is None:
+                    try:
+                        record = clean_record(record)
+                    except ValueError as exc:
+                        error = str(exc)
+                if error is not None:
+                    errors.append({'line': line, 'error': error})
+                    continue
+                # A posting repeated within the batch: the last one wins
+                by_key[record['external_id'] or ('line', line)] = record
+            records = list(by_key.values())
+
+            normalized = self.skill_extractor.normalize_skills_many(
+                [record['required_skills'] for record in records]
+            )
+            missing = [index for index, skills in enumerate(normalized) if not skills]
+            extracted = self.skill_extractor.extract_skills_many([
+                f"{records[index]['description'] or ''}\n{records[index]['requirements'] or ''}"
+                for index in missing
+            ])
+            for index, skills in zip(missing, extracted):
+                normalized[index] = skills
+            for record, skills in zip(records, normalized):
+                record['required_skills'] = skills
+
+            Job.bulk_write(records)
+            db.session.commit()
+            yield {
+                'imported': len(records),
+                'duplicates': len(batch) - len(errors) - len(records),
+                'extracted_skills': len(missing),
+                'errors': errors,
+                'last_line': batch[-1][0]
+            }
+
+    def import_jobs(self, rows, max_errors=100):
+        """Import everything and return the totals, with the first ``max_errors`` errors"""
+        summary = {'imported': 0, 'duplicates': 0, 'extracted_skills': 0, 'failed': 0, 'errors': []}
+        for batch in self.run(rows):
+            for key in ('imported', 'duplicates', 'extracted_skills'):
+                summary[key] += batch[key]
+            summary['failed'] += len(batch['errors'])
+            summary['errors'].extend(batch['errors'][:max_errors - len(summary['errors'])])
+        return summary
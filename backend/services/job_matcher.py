@@ -1,8 +1,13 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+import heapq
+from services.metrics import timed
+from services.patterns import YEARS_PATTERN
+
+def _rank_key(match):
+    # Sorted in reverse: highest score first, then lowest job id
+    return match['match_score'], -match['job_id']
 
 class JobMatcher:
+    @timed('match.calculate')
     def calculate_match(self, resume, job):
         """Calculate match score between resume and job"""
         resume_skills = set(resume.get_skills())
@@ -17,9 +22,9 @@ class JobMatcher:
         else:
             skill_match_score = 0
         
-        # Experience matching (30% weight)
+        # Experience matching (30% weight); unknown experience counts as none
         exp_required = self._extract_years(job.experience_required)
-        exp_score = self._calculate_experience_match(resume.experience_years, exp_required) * 30
+        exp_score = self._calculate_experience_match(resume.experience_years or 0, exp_required) * 30
         
         total_score = int(skill_match_score + exp_score)
         
@@ -30,12 +35,95 @@ class JobMatcher:
             'experience_match': exp_score > 0
         }
     
+    @timed('match.score_matrix')
+    def score_matrix(self, resumes, jobs, include_text_similarity=False):
+        """Score every resume against every job in one batch.
+        
+        Resumes and jobs are encoded as sparse indicator matrices over skill
+        ids (column i is skill id i), so the skill overlap of the whole N x M
+        grid is a single sparse product. The scores are identical to calling
+        calculate_match on each pair.
+        """
+        import numpy as np
+        
+        resume_skills = [set(resume.get_skill_ids()) for resume in resumes]
+        job_skills = [set(job.get_skill_ids()) for job in jobs]
+        width = max((max(skills) for skills in resume_skills + job_skills if skills), default=-1) + 1
+        
+        resume_matrix = self._skill_matrix(resume_skills, width)
+        job_matrix = self._skill_matrix(job_skills, width)
+        
+        # Skill matching (70% weight)
+        overlap = (resume_matrix @ job_matrix.T).toarray()
+        job_skill_counts = np.array([len(skills) for skills in job_skills], dtype=np.float64)
+        skill_ratio = np.divide(
+            overlap, job_skill_counts,
+            out=np.zeros_like(overlap), where=job_skill_counts > 0
+        )
+        skill_match_score = skill_ratio * 70
+        
+        # Experience matching (30% weight)
+        resume_exp = np.array([resume.experience_years or 0 for resume in resumes], dtype=np.float64)
+        exp_required = np.array([self._extract_years(job.experience_required) for job in jobs], dtype=np.float64)
+        exp_ratio = np.divide(
+            resume_exp[:, None], exp_required[None, :],
+            out=np.ones(overlap.shape), where=(exp_required[None, :] > 0) & (resume_exp[:, None] < exp_required[None, :])
+        )
+        exp_score = exp_ratio * 30
+        
+        result = {
+            'match_scores': (skill_match_score + exp_score).astype(int),
+            'matching_counts': overlap.astype(int),
+            'experience_match': exp_score > 0
+        }
+        
+        if include_text_similarity:
+            # One query for every text rather than one per resume.raw_text
+            from models.resume import DocumentText
+            texts = DocumentText.load_many([resume.content_hash for resume in resumes if resume.content_hash])
+            result['text_similarity'] = self._text_similarity(
+                [texts.get(resume.content_hash) or '' for resume in resumes],
+                [job.description or '' for job in jobs]
+            )
+        
+        return result
+    
+    def _skill_matrix(self, skill_sets, width):
+        """Build a sparse row-per-document skill id indicator matrix"""
+        import numpy as np
+        from scipy import sparse
+        
+        rows = []
+        cols = []
+        for row, skills in enumerate(skill_sets):
+            rows.extend([row] * len(skills))
+            cols.extend(skills)
+        data = np.ones(len(rows), dtype=np.float64)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(skill_sets), width))
+    
+    def _text_similarity(self, resume_texts, job_texts):
+        """TF-IDF cosine similarity between resume and job texts"""
+        # scikit-learn takes about a second to import and only this optional
+        # path needs it, so it is loaded on first use
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        if not resume_texts or not job_texts:
+            return np.zeros((len(resume_texts), len(job_texts)))
+        vectorizer = TfidfVectorizer(stop_words='english')
+        try:
+            tfidf = vectorizer.fit_transform(resume_texts + job_texts)
+        except ValueError:
+            # Every document is empty or only stop words
+            return np.zeros((len(resume_texts), len(job_texts)))
+        return cosine_similarity(tfidf[:len(resume_texts)], tfidf[len(resume_texts):])
+    
     def _extract_years(self, text):
         """Extract years from text like '3+ years'"""
-        import re
         if not text:
             return 0
-        match = re.search(r'(\d+)', text)
+        match = YEARS_PATTERN.search(text)
         return int(match.group(1)) if match else 0
     
     def _calculate_experience_match(self, resume_exp, required_exp):
@@ -46,6 +134,13 @@ class JobMatcher:
             return 1.0
         return resume_exp / required_exp
     
-    def rank_jobs(self, matches):
-        """Rank jobs by match score"""
-        return sorted(matches, key=lambda x: x['match_score'], reverse=True)
\ No newline at end of file
+    @timed('match.rank')
+    def rank_jobs(self, matches, limit=None):
+        """Rank jobs by match score, keeping only the best ``limit`` if given.
+        
+        Equal scores are ordered by job id, so offset pages never overlap.
+        """
+        if limit is None:
+            return sorted(matches, key=_rank_key, reverse=True)
+        # Bounded heap: O(n log k) and only k entries kept
+        return heapq.nlargest(limit, matches, key=_rank_key)
\ No newline at end of file
@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCacheBackend:
+    """In-process LRU store with a time-to-live per entry"""
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """LRU/TTL store in a SQLite file, shared by every worker on the host"""
+
+    def __init__(self, path, max_entries=10000, ttl=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS match_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_match_cache_accessed ON match_cache (accessed_at)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute('SELECT value, expires_at FROM match_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        with conn:
+            if expires_at < now:
+                conn.execute('DELETE FROM match_cache WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE match_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return json.loads(value)
+
+    def set(self, key, value):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO match_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), now + self.ttl, now)
+            )
+            conn.execute('DELETE FROM match_cache WHERE expires_at < ?', (now,))
+            conn.execute(
+                'DELETE FROM match_cache WHERE key IN ('
+                'SELECT key FROM match_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM match_cache')
+
+
+class MatchCache:
+    """Cache of job match responses with hit/miss accounting.
+
+    Keys combine the resume id, its ``updated_at`` and the job catalogue
+    version, so any change to the resume or to a job yields a fresh key and
+    stale entries simply age out of the backend.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, resume, catalog_version, *params):
+        parts = [resume.id, resume.updated_at.isoformat() if resume.updated_at else '', catalog_version]
+        parts.extend(params)
+        return ':'.join(str(part) for part in parts)
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+def create_match_cache(config):
+    """Build the match cache described by the app config"""
+    backend_name = config.get('MATCH_CACHE_BACKEND', 'memory')
+    max_entries = config.get('MATCH_CACHE_MAX_ENTRIES', 1024)
+    ttl = config.get('MATCH_CACHE_TTL', 300)
+
+    if backend_name == 'memory':
+        backend = MemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+    elif backend_name == 'sqlite':
+        backend = SQLiteCacheBackend(config.get('MATCH_CACHE_PATH', 'match_cache.db'), max_entries=max_entries, ttl=ttl)
+    else:
+        raise ValueError(f'Unknown match cache backend: {backend_name}')
+
+    return MatchCache(backend)
@@ -0,0 +1,294 @@
+import bisect
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Seconds; suits both sub-millisecond stages and multi-second PDF parses
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, in the Prometheus layout"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            series = {key: ([*counts], total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                yield f'{self.name}_bucket', labels + (('le', le),), cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+class MetricsRegistry:
+    """Named metrics of this process, rendered in the Prometheus text format.
+
+    Values are kept per process: with several server workers, each one is
+    scraped (or reports) on its own, as with the default prometheus_client
+    setup. ``collectors`` are called at render time for values owned by
+    other objects, such as cache hit counters.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, name, kind, help_text, collect):
+        """Add a metric whose samples ``collect()`` returns as ``[(labels dict, value), ...]``"""
+        self.collectors.append((name, kind, help_text, collect))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for name, kind, help_text, collect in self.collectors:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in collect():
+                lines.append(f'{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.register(Histogram(
+    'resume_analyzer_stage_duration_seconds',
+    'Time spent in a hot-path stage (text extraction, analysis detectors, job scoring)',
+    ['stage']
+))
+request_seconds = registry.register(Histogram(
+    'resume_analyzer_request_duration_seconds',
+    'HTTP request latency by route',
+    ['method', 'endpoint', 'status']
+))
+commit_seconds = registry.register(Histogram(
+    'resume_analyzer_db_commit_duration_seconds',
+    'Database commit time (flush included) by route',
+    ['endpoint']
+))
+profiled_requests = registry.register(Counter(
+    'resume_analyzer_profiled_requests_total',
+    'Requests run under the profiler',
+    ['endpoint']
+))
+
+
+def stage_timer(stage):
+    """Context manager recording the duration of a named stage"""
+    return stage_seconds.time(stage=stage)
+
+
+def timed(stage):
+    """Decorator recording every call of the function as a named stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_seconds.time(stage=stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _endpoint_label():
+    from flask import has_request_context, request
+    if not has_request_context():
+        return 'background'
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+def _start_commit_timer(session):
+    # Savepoint releases also fire the commit events; time only the real commit
+    if not session.in_nested_transaction():
+        session.info['commit_started'] = time.perf_counter()
+
+
+def _record_commit_time(session):
+    if session.in_nested_transaction():
+        return
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        commit_seconds.observe(time.perf_counter() - started, endpoint=_endpoint_label())
+
+
+class RequestProfiler:
+    """Optional cProfile sampling of whole requests.
+
+    When enabled, a request is profiled if it asks for it (``?profile=1`` or
+    an ``X-Profile: 1`` header) or is picked at random with
+    ``sample_rate``. Only one request is profiled at a time; the stats are
+    written as ``.prof`` files (readable with ``pstats`` or snakeviz) and the
+    top entries are logged.
+    """
+
+    def __init__(self, directory, sample_rate=0.0, top=25):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.top = top
+        self._lock = threading.Lock()
+
+    def wanted(self, request):
+        if request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1':
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        """Return a running profiler, or None if another request holds it"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def finish(self, profiler, endpoint):
+        """Stop the profiler, save its stats and return the file name"""
+        profiler.disable()
+        self._lock.release()
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', endpoint).strip('_') or 'root'
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        path = os.path.join(self.directory, name)
+        profiler.dump_stats(path)
+        profiled_requests.inc(endpoint=endpoint)
+        if logger.isEnabledFor(logging.DEBUG):
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(self.top)
+            logger.debug('Profile of %s (%s):\n%s', endpoint, path, out.getvalue())
+        return name
+
+    def abandon(self, profiler):
+        profiler.disable()
+        self._lock.release()
+
+
+def init_app(app):
+    """Record request latency and commit time for every route, and set up request profiling"""
+    # Imported here so analysis worker processes, which only use the
+    # timers, start without Flask and SQLAlchemy
+    from flask import g, request
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if not event.contains(Session, 'before_commit', _start_commit_timer):
+        event.listen(Session, 'before_commit', _start_commit_timer)
+        event.listen(Session, 'after_commit', _record_commit_time)
+
+    profiler = None
+    if app.config.get('PROFILING_ENABLED'):
+        profiler = RequestProfiler(app.config['PROFILE_DIR'], sample_rate=app.config['PROFILE_SAMPLE_RATE'])
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+        if profiler is not None and profiler.wanted(request):
+            g.profiler = profiler.start()
+
+    @app.after_request
+    def _record_request_time(response):
+        endpoint = _endpoint_label()
+        running = g.pop('profiler', None)
+        if running is not None:
+            response.headers['X-Profile-File'] = profiler.finish(running, endpoint)
+        started = g.pop('request_started', None)
+        if started is not None:
+            request_seconds.observe(
+                time.perf_counter() - started,
+                method=request.method, endpoint=endpoint, status=response.status_code
+            )
+        return response
+
+    @app.teardown_request
+    def _release_profiler(exc):
+        # after_request is skipped if a later hook fails; never leave it running
+        running = g.pop('profiler', None)
+        if running is not None:
+            profiler.abandon(running)
@@ -0,0 +1,19 @@
+import re
+
+# Regular expressions used on the hot path, compiled once at import time.
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+PHONE_PATTERNS = (
+    re.compile(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'),
+    re.compile(r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+)
+
+EXPERIENCE_PATTERNS = (
+    re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience', re.IGNORECASE),
+    re.compile(r'experience[:\s]+(\d+)\+?\s*years?', re.IGNORECASE),
+    re.compile(r'(\d+)\+?\s*years?\s+in', re.IGNORECASE)
+)
+
+YEARS_PATTERN = re.compile(r'(\d+)')
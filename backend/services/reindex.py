@@ -0,0 +1,74 @@
+import time
+from collections import Counter
+from app import db
+from models.resume import DocumentText, Resume
+
+
+class ResumeReindexer:
+    """Bring stored resume analyses up to date with the current rules.
+
+    Resumes analyzed with other stage versions (a grown skill vocabulary, a
+    changed detector) are re-analyzed from their stored text, rerunning only
+    the stale stages, in batches with one commit each. Refreshed rows stop
+    matching the stale query, so an interrupted run simply continues where it
+    stopped. After every batch the job sleeps in proportion to the time the
+    batch took, keeping its share of CPU and database time near ``max_load``.
+    """
+
+    def __init__(self, parser, batch_size=100, max_load=0.5):
+        if not 0 < max_load <= 1:
+            raise ValueError('max_load must be in (0, 1]')
+        self.parser = parser
+        self.batch_size = batch_size
+        self.max_load = max_load
+
+    def stale_query(self):
+        version = Resume.version_key(self.parser.stage_versions())
+        has_text = db.exists().where(DocumentText.content_hash == Resume.content_hash)
+        return Resume.query.filter(
+            Resume.status == 'completed',
+            has_text,
+            db.or_(Resume.analysis_version.is_(None), Resume.analysis_version != version)
+        )
+
+    def run(self, limit=None):
+        """Re-analyze stale resumes, yielding a summary after each batch"""
+        versions = self.parser.stage_versions()
+        last_id = 0
+        done = 0
+        while limit is None or done < limit:
+            started = time.monotonic()
+            size = self.batch_size if limit is None else min(self.batch_size, limit - done)
+            resumes = self.stale_query().filter(Resume.id > last_id).order_by(Resume.id).limit(size).all()
+            if not resumes:
+                return
+            texts = DocumentText.load_many([resume.content_hash for resume in resumes])
+
+            # Skills are extracted for the whole batch at once (nlp.pipe with
+            # the spaCy engine)
+            pipeline = self.parser.pipeline
+            needs_skills = [
+                resume for resume in resumes
+                if 'skills' in pipeline.stale_stages(resume.get_analysis_versions())
+            ]
+            skills = dict(zip(
+                [resume.id for resume in needs_skills],
+                self.parser.skill_extractor.extract_skills_many([texts[resume.content_hash] for resume in needs_skills])
+            ))
+
+            stages = Counter()
+            for resume in resumes:
+                analysis, stale = self.parser.reanalyze_resume(
+                    texts[resume.content_hash], resume.stored_analysis(), resume.get_analysis_versions(),
+                    precomputed={'skills': skills[resume.id]} if resume.id in skills else None
+                )
+                resume.apply_analysis(analysis, versions)
+                stages.update(stale)
+            db.session.commit()
+
+            done += len(resumes)
+            last_id = resumes[-1].id
+            yield {'resumes': len(resumes), 'last_id': last_id, 'stages': dict(stages)}
+
+            if self.max_load < 1:
+                time.sleep((time.monotonic() - started) * (1 - self.max_load) / self.max_load)
@@ -1,72 +1,206 @@
-import re
-import PyPDF2
-import docx
+import io
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
 from services.skill_extractor import SkillExtractor
+from services.analysis_pipeline import AnalysisPipeline
+from services.metrics import stage_timer
+from services.patterns import EMAIL_PATTERN, PHONE_PATTERNS, EXPERIENCE_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+class ExtractionTimeout(Exception):
+    """Raised inside a time_limit block once its time is up"""
+
+@contextmanager
+def time_limit(seconds):
+    """Interrupt the block with ExtractionTimeout after ``seconds``.
+    
+    Uses SIGALRM, so the limit is only enforced in the main thread of a
+    process, as in the analysis pool workers; elsewhere it is not applied.
+    """
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    def expired(signum, frame):
+        raise ExtractionTimeout()
+    
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
 
 class ResumeParser:
-    def __init__(self):
-        self.skill_extractor = SkillExtractor()
+    def __init__(self, max_pdf_pages=None, pdf_time_limit=None, skill_engine='regex', spacy_model=None,
+                 skill_engine_processes=1):
+        # Bounds for PDF extraction; None means unlimited
+        self.max_pdf_pages = max_pdf_pages
+        self.pdf_time_limit = pdf_time_limit
+        self.skill_extractor = SkillExtractor(engine=skill_engine, spacy_model=spacy_model,
+                                              n_process=skill_engine_processes)
+        self.pipeline = self._build_pipeline()
     
     def extract_text_from_file(self, filepath):
         """Extract text from PDF, DOCX, or TXT file"""
-        if filepath.endswith('.pdf'):
-            return self._extract_from_pdf(filepath)
-        elif filepath.endswith('.docx'):
-            return self._extract_from_docx(filepath)
-        elif filepath.endswith('.txt'):
-            return self._extract_from_txt(filepath)
-        else:
-            raise ValueError('Unsupported file format')
+        return self.extract_text(filepath)
     
-    def _extract_from_pdf(self, filepath):
-        text = ''
-        with open(filepath, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+    def extract_text(self, source):
+        """Extract text from a file path, bytes, or a binary file-like object.
+        
+        The format is detected from the leading magic bytes, not the file name.
+        Werkzeug FileStorage objects are read through their stream.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                return self._extract_from_stream(file)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return self._extract_from_stream(io.BytesIO(source))
+        stream = getattr(source, 'stream', source)
+        if not stream.seekable():
+            stream = io.BytesIO(stream.read())
+        return self._extract_from_stream(stream)
+    
+    def detect_format(self, head):
+        """Identify the document format from its first bytes"""
+        if head.startswith(b'%PDF-'):
+            return 'pdf'
+        if head.startswith(b'PK\x03\x04'):
+            # DOCX files are zip containers
+            return 'docx'
+        return 'txt'
+    
+    def _extract_from_stream(self, stream):
+        start = stream.tell()
+        file_format = self.detect_format(stream.read(8))
+        stream.seek(start)
+        
+        with stage_timer(f'extract.{file_format}'):
+            if file_format == 'pdf':
+                return self._extract_from_pdf(stream)
+            elif file_format == 'docx':
+                return self._extract_from_docx(stream)
+            return self._extract_from_txt(stream)
+    
+    def _extract_from_pdf(self, stream):
+        # The page loop checks the time limit between pages; the alarm also
+        # interrupts a single page that takes too long
+        pages = []
+        try:
+            with time_limit(self.pdf_time_limit):
+                for page in self.iter_pdf_pages(stream):
+                    pages.append(page)
+        except ExtractionTimeout:
+            logger.warning('Stopped PDF extraction at time limit (%.1fs)', self.pdf_time_limit)
+        return ''.join(pages)
+    
+    def iter_pdf_pages(self, stream):
+        """Yield the text of one PDF page at a time.
+        
+        Pages are read lazily from the stream; extraction stops after
+        max_pdf_pages pages or once pdf_time_limit seconds have passed, so a
+        very long or pathological document cannot pin a worker.
+        """
+        import PyPDF2
+        
+        deadline = time.monotonic() + self.pdf_time_limit if self.pdf_time_limit else None
+        pdf_reader = PyPDF2.PdfReader(stream)
+        for index, page in enumerate(pdf_reader.pages):
+            if self.max_pdf_pages is not None and index >= self.max_pdf_pages:
+                logger.warning('Stopped PDF extraction at page limit (%d)', self.max_pdf_pages)
+                return
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning('Stopped PDF extraction at time limit (%.1fs)', self.pdf_time_limit)
+                return
+            yield page.extract_text() or ''
     
-    def _extract_from_docx(self, filepath):
-        doc = docx.Document(filepath)
+    def _extract_from_docx(self, stream):
+        import docx
+        
+        doc = docx.Document(stream)
         return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
     
-    def _extract_from_txt(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return file.read()
+    def _extract_from_txt(self, stream):
+        try:
+            text = stream.read().decode('utf-8')
+        except UnicodeDecodeError:
+            raise ValueError('Unsupported file format')
+        # Universal newlines, as reading the file in text mode did
+        return io.StringIO(text, newline=None).read()
     
     def analyze_resume(self, text):
         """Analyze resume text and return structured data"""
-        analysis = {
-            'skills': self.skill_extractor.extract_skills(text),
-            'experience_years': self._extract_experience(text),
-            'education': self._extract_education(text),
-            'ats_score': self._calculate_ats_score(text),
-            'word_count': len(text.split()),
-            'has_email': self._has_email(text),
-            'has_phone': self._has_phone(text),
-            'sections': self._identify_sections(text)
-        }
-        
-        return analysis
+        context = self.pipeline.run(text)
+        return dict(context.results)
     
-    def _extract_experience(self, text):
-        """Extract years of experience from text"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-            r'experience[:\s]+(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s+in'
+    def analyze_resumes(self, texts):
+        """Analyze many texts; skills are extracted for the whole batch at once"""
+        texts = list(texts)
+        others = [name for name in self.pipeline.stage_names() if name != 'skills']
+        return [
+            dict(self.pipeline.run(text, results={'skills': skills}, only=others).results)
+            for text, skills in zip(texts, self.skill_extractor.extract_skills_many(texts))
         ]
+    
+    def reanalyze_resume(self, text, previous, versions, precomputed=None):
+        """Refresh a stored analysis, rerunning only the stages that changed.
         
+        ``versions`` are the stage versions the stored analysis was made with.
+        ``precomputed`` holds fresh results of stale stages computed in bulk
+        (e.g. skills from extract_skills_many). Returns the updated analysis
+        and the names of the stale stages.
+        """
+        stale = self.pipeline.stale_stages(versions)
+        kept = {name: value for name, value in previous.items() if name not in stale}
+        kept.update(precomputed or {})
+        context = self.pipeline.run(text, results=kept, only=[name for name in stale if name not in kept])
+        return dict(context.results), stale
+    
+    def stage_versions(self):
+        return self.pipeline.stage_versions()
+    
+    def _build_pipeline(self):
+        """Detector stages, in order; the ATS score reads the earlier results.
+        
+        Bump a stage's version whenever its rules change, so stored analyses
+        made with the old rules are picked up by the re-index job.
+        """
+        return AnalysisPipeline([
+            ('skills', self._extract_skills, self.skill_extractor.version),
+            ('experience_years', self._extract_experience, 1),
+            ('education', self._extract_education, 1),
+            ('word_count', self._count_words, 1),
+            ('has_email', self._has_email, 1),
+            ('has_phone', self._has_phone, 1),
+            ('sections', self._identify_sections, 1),
+            ('ats_score', self._calculate_ats_score, 1,
+             ('has_email', 'has_phone', 'sections', 'skills', 'word_count'))
+        ])
+    
+    def _extract_skills(self, context):
+        return self.skill_extractor.extract_skills(context.text, text_lower=context.text_lower)
+    
+    def _count_words(self, context):
+        return len(context.tokens)
+    
+    def _extract_experience(self, context):
+        """Extract years of experience from text"""
         years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.findall(context.text)
             years.extend([int(match) for match in matches])
         
         return max(years) if years else 0
     
-    def _extract_education(self, text):
+    def _extract_education(self, context):
         """Extract highest education level"""
-        text_lower = text.lower()
+        text_lower = context.text_lower
         
         degrees = [
             ('phd', 'PhD'),
@@ -88,18 +222,19 @@ class ResumeParser:
         
         return 'Not specified'
     
-    def _calculate_ats_score(self, text):
+    def _calculate_ats_score(self, context):
         """Calculate ATS compatibility score"""
+        results = context.results
         score = 0
         
         # Contact information (25 points)
-        if self._has_email(text):
+        if results['has_email']:
             score += 15
-        if self._has_phone(text):
+        if results['has_phone']:
             score += 10
         
         # Key sections (30 points)
-        sections = self._identify_sections(text)
+        sections = results['sections']
         if 'experience' in sections:
             score += 15
         if 'education' in sections:
@@ -108,7 +243,7 @@ class ResumeParser:
             score += 5
         
         # Skills count (20 points)
-        skills = self.skill_extractor.extract_skills(text)
+        skills = results['skills']
         if len(skills) > 10:
             score += 20
         elif len(skills) > 5:
@@ -117,7 +252,7 @@ class ResumeParser:
             score += 10
         
         # Length (25 points)
-        word_count = len(text.split())
+        word_count = results['word_count']
         if 300 <= word_count <= 1000:
             score += 25
         elif word_count >= 200:
@@ -127,23 +262,17 @@ class ResumeParser:
         
         return min(score, 100)
     
-    def _has_email(self, text):
+    def _has_email(self, context):
         """Check if text contains email"""
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return bool(re.search(pattern, text))
+        return bool(EMAIL_PATTERN.search(context.text))
     
-    def _has_phone(self, text):
+    def _has_phone(self, context):
         """Check if text contains phone number"""
-        patterns = [
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
-            r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}',
-            r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'
-        ]
-        return any(re.search(pattern, text) for pattern in patterns)
+        return any(pattern.search(context.text) for pattern in PHONE_PATTERNS)
     
-    def _identify_sections(self, text):
+    def _identify_sections(self, context):
         """Identify resume sections"""
-        text_lower = text.lower()
+        text_lower = context.text_lower
         sections = []
         
         section_keywords = {
@@ -0,0 +1,116 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from services.resume_parser import ResumeParser
+from services.job_matcher import JobMatcher
+from services.match_cache import create_match_cache
+from services.analysis_cache import AnalysisCache
+from services.analysis_queue import AnalysisQueue
+from services.analysis_worker import init_worker, worker_config
+from services.storage import create_storage
+from services.metrics import registry
+from utils.serialization import FragmentCache
+
+# One instance of each service per worker process. The services hold no
+# per-request state, so the same objects are shared by every request thread.
+_instances = {}
+_lock = threading.RLock()
+
+def _get_instance(name, factory):
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = _instances[name] = factory()
+    return instance
+
+def get_resume_parser():
+    return _get_instance('resume_parser', lambda: ResumeParser(
+        max_pdf_pages=current_app.config['PDF_MAX_PAGES'],
+        pdf_time_limit=current_app.config['PDF_TIME_LIMIT'],
+        skill_engine=current_app.config['SKILL_ENGINE'],
+        spacy_model=current_app.config['SPACY_MODEL'],
+        skill_engine_processes=current_app.config['SKILL_ENGINE_PROCESSES']
+    ))
+
+def get_skill_extractor():
+    return get_resume_parser().skill_extractor
+
+def get_analysis_cache():
+    return _get_instance('analysis_cache', lambda: AnalysisCache(get_resume_parser()))
+
+def get_analysis_queue():
+    def create():
+        config = current_app.config
+        return AnalysisQueue(
+            current_app._get_current_object(),
+            get_analysis_cache(),
+            max_workers=config['ANALYSIS_WORKERS'],
+            poll_interval=config['ANALYSIS_POLL_INTERVAL'],
+            stale_after=config['ANALYSIS_STALE_AFTER'],
+            start_method=config['ANALYSIS_START_METHOD'],
+            worker_config=worker_config(config)
+        )
+    return _get_instance('analysis_queue', create)
+
+def get_analysis_pool():
+    """Process pool for synchronous bulk uploads, shared by all requests"""
+    return _get_instance('analysis_pool', lambda: ProcessPoolExecutor(
+        max_workers=current_app.config['ANALYSIS_WORKERS'] or multiprocessing.cpu_count(),
+        mp_context=multiprocessing.get_context(current_app.config['ANALYSIS_START_METHOD']),
+        initializer=init_worker,
+        initargs=(worker_config(current_app.config),)
+    ))
+
+def discard_analysis_pool():
+    """Drop a broken analysis pool so the next request starts a new one"""
+    with _lock:
+        pool = _instances.pop('analysis_pool', None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def get_job_matcher():
+    return _get_instance('job_matcher', JobMatcher)
+
+def get_match_cache():
+    return _get_instance('match_cache', lambda: create_match_cache(current_app.config))
+
+def get_job_json_cache():
+    return _get_instance('job_json_cache', lambda: FragmentCache(current_app.config['JOB_JSON_CACHE_SIZE']))
+
+def get_storage():
+    return _get_instance('storage', lambda: create_storage(current_app.config))
+
+def get_candidate_index():
+    # Imported here: the index needs NumPy, which most workers never load
+    from services.candidate_index import CandidateIndex
+
+    return _get_instance('candidate_index', lambda: CandidateIndex(
+        current_app._get_current_object(),
+        get_skill_extractor().skill_database,
+        max_staleness=current_app.config['CANDIDATE_INDEX_MAX_STALENESS']
+    ))
+
+def _cache_samples(field):
+    # Only report caches this process has already created
+    samples = []
+    for name in ('analysis_cache', 'match_cache'):
+        cache = _instances.get(name)
+        if cache is not None:
+            samples.append(({'cache': name}, cache.stats()[field]))
+    return samples
+
+registry.add_collector(
+    'resume_analyzer_cache_hits_total', 'counter', 'Cache lookups that found an entry',
+    lambda: _cache_samples('hits')
+)
+registry.add_collector(
+    'resume_analyzer_cache_misses_total', 'counter', 'Cache lookups that found nothing',
+    lambda: _cache_samples('misses')
+)
+registry.add_collector(
+    'resume_analyzer_cache_hit_ratio', 'gauge', 'Share of cache lookups that were hits',
+    lambda: _cache_samples('hit_rate')
+)
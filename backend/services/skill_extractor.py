@@ -1,8 +1,31 @@
-import re
+import hashlib
+import json
+from services.skill_matcher import SkillMatcher
 
 class SkillExtractor:
-    def __init__(self):
-        self.skill_database = self._load_skill_database()
+    """Find skills of the skill database in text.
+    
+    The ``regex`` engine matches the skill names exactly (case-insensitive,
+    on word boundaries). The ``spacy`` engine adds a spaCy EntityRuler that
+    also recognizes the aliases of ``_load_skill_aliases`` (ReactJS, Postgres,
+    k8s, ...) and reports them under the canonical name.
+    """
+    
+    def __init__(self, engine='regex', spacy_model=None, n_process=1):
+        self.skill_database = tuple(self._load_skill_database())
+        self.aliases = self._load_skill_aliases()
+        self.matcher = SkillMatcher(self.skill_database)
+        self.engine = engine
+        self.semantic = None
+        if engine == 'spacy':
+            from services.spacy_skills import SpacySkillEngine
+            self.semantic = SpacySkillEngine(self.skill_database, self.aliases, model=spacy_model, n_process=n_process)
+        elif engine != 'regex':
+            raise ValueError(f'Unknown skill engine: {engine}')
+        
+        # Changes whenever the results can; part of the analysis version
+        rules = [engine, self.skill_database, self.semantic.patterns if self.semantic else None]
+        self.version = hashlib.sha1(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:12]
     
     def _load_skill_database(self):
         """Load common technical and soft skills"""
@@ -54,19 +77,90 @@ class SkillExtractor:
             'adaptability', 'collaboration', 'presentation', 'negotiation'
         ]
     
-    def extract_skills(self, text):
+    def _load_skill_aliases(self):
+        """Common spellings and abbreviations, mapped to the skill database name"""
+        return {
+            'reactjs': 'react', 'react.js': 'react', 'react js': 'react',
+            'react-native': 'react native',
+            'angularjs': 'angular', 'angular.js': 'angular',
+            'vuejs': 'vue.js', 'vue js': 'vue.js',
+            'nodejs': 'node.js', 'node js': 'node.js',
+            'nextjs': 'next.js', 'nuxtjs': 'nuxt.js', 'expressjs': 'express',
+            'js': 'javascript', 'ecmascript': 'javascript',
+            'golang': 'go', 'cpp': 'c++', 'c plus plus': 'c++', 'c sharp': 'c#',
+            'python3': 'python',
+            'postgres': 'postgresql', 'psql': 'postgresql', 'mongo': 'mongodb',
+            'ms sql': 'sql', 'mssql': 'sql', 'elastic search': 'elasticsearch',
+            'k8s': 'kubernetes', 'kube': 'kubernetes',
+            'amazon web services': 'aws', 'microsoft azure': 'azure',
+            'google cloud platform': 'gcp',
+            'ci cd': 'ci/cd', 'continuous integration': 'ci/cd',
+            'ml': 'machine learning',
+            'ai': 'artificial intelligence', 'natural language processing': 'nlp',
+            'sklearn': 'scikit-learn', 'scikit learn': 'scikit-learn',
+            'torch': 'pytorch',
+            'restful api': 'rest api', 'rest apis': 'rest api',
+            'test driven development': 'test-driven development',
+            'powerbi': 'power bi', 'ms excel': 'excel', 'microsoft excel': 'excel'
+        }
+    
+    def extract_skills(self, text, text_lower=None):
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
+        found = self.matcher.extract(text_lower if text_lower is not None else text.lower())
+        if self.semantic is None:
+            return found
+        return self.matcher.sort(set(found) | self.semantic.extract(text))
+    
+    def extract_skills_many(self, texts):
+        """Extract skills from many texts; the spaCy engine batches them through nlp.pipe"""
+        texts = list(texts)
+        found = [self.matcher.extract(text.lower()) for text in texts]
+        if self.semantic is None:
+            return found
+        return [
+            self.matcher.sort(set(skills) | semantic)
+            for skills, semantic in zip(found, self.semantic.extract_many(texts))
+        ]
+    
+    def normalize_skills(self, names):
+        """Map skill names as written (e.g. in a job posting) to database names"""
+        return self.normalize_skills_many([names])[0]
+    
+    def normalize_skills_many(self, name_lists):
+        """Normalize many lists of skill names at once.
+        
+        Names are matched case-insensitively against the skill database and
+        the aliases. Other names are searched for known skills (``Python 3 /
+        Django`` -> ``python``, ``django``) in one extract_skills_many call
+        for the whole batch, and are kept lower-cased when none is found.
+        Every list keeps its order, without duplicates.
+        """
+        known = set(self.skill_database)
         
-        for skill in self.skill_database:
-            # Use word boundaries for exact matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+        def canonical(key):
+            return key if key in known else self.aliases.get(key)
         
-        # Remove duplicates and return
-        return list(set(found_skills))
+        keyed = [[' '.join(str(name).lower().split()) for name in names] for names in name_lists]
+        unknown = list(dict.fromkeys(key for keys in keyed for key in keys if key and canonical(key) is None))
+        found = dict(zip(unknown, self.extract_skills_many(unknown)))
+        
+        normalized = []
+        for keys in keyed:
+            skills = []
+            for key in keys:
+                if key:
+                    skill = canonical(key)
+                    skills.extend([skill] if skill else found[key] or [key])
+            normalized.append(list(dict.fromkeys(skills)))
+        return normalized
+    
+    def find_skill_matches(self, text):
+        """Return every skill occurrence with its offsets in the lowercased text"""
+        return self.matcher.find_matches(text.lower())
+    
+    def count_skills(self, text):
+        """Return how many times each skill occurs in the text"""
+        return dict(self.matcher.count(text.lower()))
     
     def categorize_skills(self, skills):
         """Categorize skills into technical and soft skills"""
@@ -0,0 +1,84 @@
+import re
+from collections import Counter, namedtuple
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start', 'end'])
+
+
+class SkillMatcher:
+    """Find every skill of a skill database in one pass over the text.
+
+    The skills are compiled once into a trie-shaped regular expression, so the
+    text is scanned a single time instead of once per skill. Matching keeps the
+    word-boundary rules of ``\\b<skill>\\b``: a skill is reported wherever that
+    pattern would match, including overlapping skills such as ``react`` and
+    ``react native``.
+    """
+
+    _boundary = re.compile(r'\b')
+
+    def __init__(self, skills):
+        self.skills = tuple(dict.fromkeys(skills))
+        self._order = {skill: index for index, skill in enumerate(self.skills)}
+        self._pattern = re.compile(r'(?=\b(' + self._build_pattern(self.skills) + r')\b)')
+
+        # Shorter skills that are a prefix of a longer one can match at the
+        # same position; the regex only reports the longest, so keep the rest
+        # here (longest first) and check their end boundary separately.
+        self._prefixes = {
+            skill: tuple(sorted(
+                (other for other in self.skills if other != skill and skill.startswith(other)),
+                key=len,
+                reverse=True
+            ))
+            for skill in self.skills
+        }
+
+    def _build_pattern(self, skills):
+        """Build a regex alternation shaped like a trie of the skills"""
+        trie = {}
+        for skill in skills:
+            node = trie
+            for char in skill:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return self._node_pattern(trie)
+
+    def _node_pattern(self, node):
+        branches = [re.escape(char) + self._node_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Greedy optional group: longer skills are tried first and the
+            # engine backtracks to this shorter one if their boundary fails.
+            return '(?:' + pattern + ')?'
+        return pattern
+
+    def find_matches(self, text):
+        """Return every skill occurrence as ``SkillMatch(skill, start, end)``.
+
+        ``text`` is expected to be lowercased already; offsets refer to it.
+        """
+        matches = []
+        for match in self._pattern.finditer(text):
+            skill = match.group(1)
+            start = match.start(1)
+            matches.append(SkillMatch(skill, start, match.end(1)))
+            for prefix in self._prefixes[skill]:
+                end = start + len(prefix)
+                if self._boundary.match(text, end):
+                    matches.append(SkillMatch(prefix, start, end))
+        return matches
+
+    def count(self, text):
+        """Return a ``Counter`` of skill -> number of occurrences"""
+        return Counter(match.skill for match in self.find_matches(text))
+
+    def extract(self, text):
+        """Return the distinct skills found, in skill database order"""
+        return self.sort({match.skill for match in self.find_matches(text)})
+    
+    def sort(self, skills):
+        """Order distinct skills of the database as the database lists them"""
+        return sorted(skills, key=self._order.__getitem__)
@@ -0,0 +1,79 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Loaded pipelines, one per (model, patterns) per process
+_pipelines = {}
+_lock = threading.Lock()
+
+
+def _build_pipeline(model, patterns):
+    import spacy
+
+    nlp = None
+    if model:
+        try:
+            # Only the tokenizer is needed; the ruler supplies the entities
+            nlp = spacy.load(model, exclude=['tagger', 'parser', 'lemmatizer', 'attribute_ruler', 'senter', 'ner'])
+        except OSError:
+            logger.warning('spaCy model %s is not installed; using a blank English pipeline', model)
+    if nlp is None:
+        nlp = spacy.blank('en')
+    ruler = nlp.add_pipe('entity_ruler', config={'phrase_matcher_attr': 'LOWER'})
+    ruler.add_patterns([
+        # Phrase patterns match on the lower-cased tokens; ORTH is exact
+        {'label': 'SKILL', 'pattern': [{'ORTH': phrase}] if exact else phrase, 'id': skill}
+        for phrase, skill, exact in patterns
+    ])
+    return nlp
+
+
+def _is_short_alias(alias):
+    # Two or three letters: ordinary words or abbreviations in prose
+    return alias.isalpha() and len(alias) <= 3
+
+
+class SpacySkillEngine:
+    """Skill extraction with a spaCy EntityRuler over skills and their aliases.
+
+    Every skill and alias (e.g. ``k8s`` -> ``kubernetes``) becomes a
+    case-insensitive phrase pattern whose entity id is the canonical skill,
+    so variants are reported under the name of the skill database. Short
+    aliases (``ml``, ``ai``, ``js``) only match when written in capitals.
+    The pipeline is built on first use, once per process. ``model`` names an
+    installed spaCy package whose tokenizer is used; without one (or when it
+    is missing) a blank English pipeline is used, which needs no download.
+    """
+
+    def __init__(self, skills, aliases, model=None, n_process=1, batch_size=64):
+        self.model = model
+        self.n_process = n_process
+        self.batch_size = batch_size
+        patterns = [(skill, skill, False) for skill in skills]
+        for alias, skill in aliases.items():
+            if _is_short_alias(alias):
+                patterns.append((alias.upper(), skill, True))
+            else:
+                patterns.append((alias, skill, False))
+        self.patterns = tuple(dict.fromkeys(patterns))
+        self._key = (model, self.patterns)
+
+    @property
+    def nlp(self):
+        nlp = _pipelines.get(self._key)
+        if nlp is None:
+            with _lock:
+                nlp = _pipelines.get(self._key)
+                if nlp is None:
+                    nlp = _pipelines[self._key] = _build_pipeline(self.model, self.patterns)
+        return nlp
+
+    def extract(self, text):
+        """Return the set of canonical skills found in the text"""
+        return {ent.ent_id_ for ent in self.nlp(text).ents if ent.label_ == 'SKILL'}
+
+    def extract_many(self, texts):
+        """Like extract for many texts, batched through ``nlp.pipe``"""
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        return [{ent.ent_id_ for ent in doc.ents if ent.label_ == 'SKILL'} for doc in docs]
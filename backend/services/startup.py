@@ -0,0 +1,89 @@
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Loaded on first use by the request paths that need them (matching, PDF and
+# DOCX extraction). A pre-forking server loads them once in the master
+# instead, see preload().
+HEAVY_MODULES = (
+    'numpy',
+    'scipy.sparse',
+    'sklearn.feature_extraction.text',
+    'sklearn.metrics.pairwise',
+    'PyPDF2',
+    'docx'
+)
+
+# Report of the latest startup in this process, for the metrics endpoint
+_current = None
+
+
+class StartupReport:
+    """Wall time of each startup phase, in the order they ran"""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    @property
+    def total(self):
+        return sum(seconds for _, seconds in self.phases)
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total * 1000, 1),
+            'phases': {name: round(seconds * 1000, 1) for name, seconds in self.phases}
+        }
+
+    def log(self):
+        logger.info('Application started in %.1f ms (%s)', self.total * 1000,
+                    ', '.join(f'{name} {seconds * 1000:.1f} ms' for name, seconds in self.phases))
+
+
+def publish(report):
+    """Make ``report`` the one exported as resume_analyzer_startup_seconds"""
+    global _current
+    _current = report
+
+
+def preload(app):
+    """Import the heavy modules and build the shared parser ahead of time.
+
+    Meant for the master of a pre-forking server (see gunicorn.conf.py):
+    work done here is inherited by every worker instead of being repeated on
+    the first request each worker serves. Nothing here opens a database
+    connection, which must not be shared across a fork. The phases are added
+    to the application's startup report.
+    """
+    report = app.extensions['startup_report']
+    for module in HEAVY_MODULES:
+        with report.phase(f'preload.{module}'):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                logger.warning('Could not preload %s', module)
+
+    from services.shared import get_resume_parser
+
+    with app.app_context(), report.phase('preload.parser'):
+        semantic = get_resume_parser().skill_extractor.semantic
+        if semantic is not None:
+            semantic.nlp
+    return report
+
+
+registry.add_collector(
+    'resume_analyzer_startup_seconds', 'gauge', 'Duration of each application startup phase',
+    lambda: [({'phase': name}, seconds) for name, seconds in _current.phases] if _current else []
+)
@@ -0,0 +1,225 @@
+import io
+import mmap
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+
+class MappedFile(io.RawIOBase):
+    """Read-only, seekable file object over a memory map.
+
+    Parsers expect a regular binary stream; mmap objects lack seekable()
+    before Python 3.13, so they are wrapped instead of copied.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._buffer.read(None if size is None or size < 0 else size)
+
+    def readinto(self, target):
+        data = self._buffer.read(len(target))
+        target[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._buffer.seek(offset, whence)
+        return self._buffer.tell()
+
+    def tell(self):
+        return self._buffer.tell()
+
+
+class StorageBackend(ABC):
+    """Interface of the upload stores.
+
+    Objects are addressed by key (``<content hash>.<ext>`` for uploads), are
+    written once and never modified, and can be removed in bulk.
+    """
+
+    @abstractmethod
+    def put(self, key, data):
+        """Store ``data`` under ``key`` unless an object is already there"""
+
+    @abstractmethod
+    def exists(self, key):
+        """Whether an object is stored under ``key``"""
+
+    @abstractmethod
+    def open(self, key):
+        """Context manager yielding a read-only binary stream of the object"""
+
+    @abstractmethod
+    def delete_many(self, keys):
+        """Remove the objects under ``keys``; missing ones are ignored"""
+
+
+class LocalStorage(StorageBackend):
+    """Filesystem store sharded by key prefix.
+
+    ``0a1b...ff.pdf`` is stored as ``<root>/0a/1b/0a1b...ff.pdf`` so no
+    directory grows beyond a few hundred entries. Reads are memory-mapped.
+    """
+
+    def __init__(self, root, shard_levels=2, shard_width=2):
+        self.root = root
+        self.shard_levels = shard_levels
+        self.shard_width = shard_width
+
+    def path(self, key):
+        if os.path.dirname(key):
+            # Rows written before sharding hold a full file path
+            return key
+        shards = [key[i * self.shard_width:(i + 1) * self.shard_width] for i in range(self.shard_levels)]
+        return os.path.join(self.root, *shards, key)
+
+    def put(self, key, data):
+        path = self.path(key)
+        if os.path.exists(path):
+            return
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as out:
+            out.write(data)
+        os.replace(out.name, path)
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    @contextmanager
+    def open(self, key):
+        with open(self.path(key), 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                yield io.BytesIO()
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield MappedFile(buffer)
+
+    def delete_many(self, keys):
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+
+class LocalObjectStoreClient:
+    """Local stand-in for an S3-compatible client.
+
+    Implements the subset of the boto3 S3 client used by ObjectStorage on top
+    of a directory (one sub-directory per bucket), so the object-store code
+    path can run without network access.
+    """
+
+    max_delete_batch = 1000
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, *key.split('/'))
+
+    def put_object(self, Bucket, Key, Body):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as out:
+            out.write(Body)
+        os.replace(out.name, path)
+        return {}
+
+    def head_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if not os.path.exists(path):
+            raise KeyError(Key)
+        return {'ContentLength': os.path.getsize(path)}
+
+    def get_object(self, Bucket, Key):
+        with open(self._path(Bucket, Key), 'rb') as file:
+            return {'Body': _Body(file.read())}
+
+    def delete_objects(self, Bucket, Delete):
+        objects = Delete['Objects']
+        if len(objects) > self.max_delete_batch:
+            raise ValueError(f'At most {self.max_delete_batch} keys per delete_objects call')
+        deleted = []
+        for item in objects:
+            try:
+                os.remove(self._path(Bucket, item['Key']))
+            except FileNotFoundError:
+                pass
+            deleted.append({'Key': item['Key']})
+        return {'Deleted': deleted}
+
+
+class _Body:
+    def __init__(self, data):
+        self._data = data
+
+    def read(self):
+        return self._data
+
+
+class ObjectStorage(StorageBackend):
+    """Store uploads in an S3-compatible bucket, sharded by key prefix"""
+
+    def __init__(self, client, bucket, prefix='uploads', shard_width=2):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.shard_width = shard_width
+
+    def object_key(self, key):
+        return '/'.join(filter(None, [self.prefix, key[:self.shard_width], key]))
+
+    def put(self, key, data):
+        if not self.exists(key):
+            self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=bytes(data))
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except Exception:
+            return False
+        return True
+
+    @contextmanager
+    def open(self, key):
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        yield io.BytesIO(response['Body'].read())
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        # S3 accepts at most 1000 keys per DeleteObjects request
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': self.object_key(key)} for key in batch], 'Quiet': True}
+            )
+
+
+def create_storage(config):
+    """Build the upload storage backend described by the app config"""
+    backend = config.get('STORAGE_BACKEND', 'local')
+
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 'object':
+        endpoint = config.get('STORAGE_ENDPOINT_URL')
+        if endpoint:
+            # A real S3-compatible service; needs boto3 installed
+            import boto3
+            client = boto3.client('s3', endpoint_url=endpoint)
+        else:
+            client = LocalObjectStoreClient(config['UPLOAD_FOLDER'])
+        return ObjectStorage(client, config.get('STORAGE_BUCKET', 'resumes'))
+    raise ValueError(f'Unknown storage backend: {backend}')
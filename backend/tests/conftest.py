@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    from models.schema import upgrade_schema
+    from services import shared
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        MATCH_CACHE_BACKEND = 'memory'
+        ANALYSIS_WORKERS = 2
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        upgrade_schema()
+    yield app
+    # Per-process services hold on to the app and its data
+    shared.discard_analysis_pool()
+    shared._instances.clear()
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    def register(email):
+        response = client.post('/api/auth/register', json={'email': email, 'password': 'secret'})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return register
@@ -0,0 +1,12 @@
+from services.shared import get_analysis_cache
+
+
+def test_each_analysis_counts_one_cache_lookup(app, client, register):
+    headers = register('alice@example.com')
+    for text in ('python developer', 'java developer', 'python developer'):
+        response = client.post('/api/resume/analyze', json={'text': text}, headers=headers)
+        assert response.status_code == 201
+
+    with app.app_context():
+        stats = get_analysis_cache().stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
@@ -0,0 +1,48 @@
+import io
+import zipfile
+
+
+def test_bulk_upload_reads_files_from_the_configured_upload_folder(app, client, register):
+    headers = register('alice@example.com')
+    files = [
+        (io.BytesIO(b'Python and Django developer, 5 years of experience'), 'alice.txt'),
+        (io.BytesIO(b'Java and Spring engineer, 3 years of experience'), 'bob.txt')
+    ]
+
+    response = client.post('/api/resume/bulk?async=0', data={'files': files}, headers=headers,
+                           content_type='multipart/form-data')
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data['failed'] == []
+    assert data['ingested'] == 2
+
+    resumes = client.get('/api/resume/list', headers=headers).get_json()['resumes']
+    assert sorted(resume['status'] for resume in resumes) == ['completed', 'completed']
+    assert {skill for resume in resumes for skill in resume['skills']} >= {'python', 'django', 'java'}
+
+
+def _zip(members):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    out.seek(0)
+    return out
+
+
+def test_bulk_upload_limits_count_uncompressed_zip_contents(app, client, register):
+    headers = register('alice@example.com')
+    app.config.update(BULK_MAX_DOCUMENTS=3, BULK_MAX_TOTAL_BYTES=1024 * 1024)
+
+    many = _zip([(f'resume{index}.txt', b'Python developer') for index in range(4)])
+    response = client.post('/api/resume/bulk', data={'files': [(many, 'many.zip')]}, headers=headers,
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+
+    # Compresses to a few KB
+    large = _zip([('resume.txt', b' ' * (2 * 1024 * 1024))])
+    response = client.post('/api/resume/bulk', data={'files': [(large, 'large.zip')]}, headers=headers,
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+
+    assert client.get('/api/resume/list', headers=headers).get_json()['resumes'] == []
@@ -0,0 +1,29 @@
+def _add_resume(client, headers, text):
+    response = client.post('/api/resume/analyze', json={'text': text}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['resume']['id']
+
+
+def test_candidates_only_include_the_callers_resumes(client, register):
+    alice = register('alice@example.com')
+    bob = register('bob@example.com')
+    alice_resume = _add_resume(client, alice, 'Python and Django developer, 5 years of experience')
+    bob_resume = _add_resume(client, bob, 'Python and Django engineer, 6 years of experience')
+
+    response = client.post('/api/jobs/create', json={
+        'title': 'Backend Engineer',
+        'company': 'Acme',
+        'description': 'Build APIs',
+        'required_skills': ['python', 'django'],
+        'experience_required': '3+ years'
+    }, headers=alice)
+    job_id = response.get_json()['job']['id']
+
+    response = client.get(f'/api/jobs/{job_id}/candidates', headers=alice)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [candidate['resume']['id'] for candidate in data['candidates']] == [alice_resume]
+    assert data['total'] == 1
+
+    data = client.get(f'/api/jobs/{job_id}/candidates', headers=bob).get_json()
+    assert [candidate['resume']['id'] for candidate in data['candidates']] == [bob_resume]
@@ -0,0 +1,51 @@
+from services import shared
+
+
+class _IdleQueue:
+    """Analysis queue that leaves enqueued resumes pending"""
+
+    def start(self):
+        pass
+
+    def notify(self):
+        pass
+
+
+def test_matching_a_resume_still_being_analyzed_is_a_conflict(client, register, monkeypatch):
+    headers = register('alice@example.com')
+    client.post('/api/jobs/create', json={
+        'title': 'Backend Engineer',
+        'company': 'Acme',
+        'description': 'Build APIs',
+        'required_skills': ['python'],
+        'experience_required': '3 years'
+    }, headers=headers)
+    monkeypatch.setitem(shared._instances, 'analysis_queue', _IdleQueue())
+    response = client.post('/api/resume/analyze?async=1', json={'text': 'Python developer'}, headers=headers)
+    assert response.status_code == 202
+    resume_id = response.get_json()['job_id']
+
+    response = client.get(f'/api/jobs/match/{resume_id}', headers=headers)
+    assert response.status_code == 409
+    assert response.get_json()['status'] == 'pending'
+
+
+def test_match_pages_do_not_overlap_when_scores_tie(client, register):
+    headers = register('alice@example.com')
+    for index in range(6):
+        client.post('/api/jobs/create', json={
+            'title': f'Engineer {index}',
+            'company': 'Acme',
+            'description': 'Build APIs',
+            'required_skills': ['python'],
+            'experience_required': '1 year'
+        }, headers=headers)
+    resume = client.post('/api/resume/analyze', json={'text': 'Python developer, 2 years of experience'},
+                         headers=headers).get_json()['resume']
+
+    job_ids = []
+    for offset in (0, 2, 4):
+        data = client.get(f"/api/jobs/match/{resume['id']}?limit=2&offset={offset}", headers=headers).get_json()
+        job_ids += [match['job']['id'] for match in data['matches']]
+    assert job_ids == sorted(set(job_ids))
+    assert len(job_ids) == 6
@@ -0,0 +1,20 @@
+import io
+
+from PyPDF2 import PdfWriter
+
+
+def _pdf():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def test_pdf_extraction_in_the_pool_is_timed(client, register):
+    headers = register('alice@example.com')
+    response = client.post('/api/resume/upload', data={'file': (io.BytesIO(_pdf()), 'resume.pdf')},
+                           headers=headers, content_type='multipart/form-data')
+    assert response.status_code == 201
+
+    assert 'stage="extract.pdf"' in client.get('/api/metrics').get_data(as_text=True)
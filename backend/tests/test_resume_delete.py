@@ -0,0 +1,66 @@
+import io
+
+from app import db
+from models.resume import DocumentText, Resume, ResumeAnalysis
+from services.shared import get_storage
+
+
+def _add_resume(client, headers, text):
+    response = client.post('/api/resume/analyze', json={'text': text}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['resume']
+
+
+def test_deleting_a_resume_removes_its_text_and_analysis(app, client, register):
+    headers = register('alice@example.com')
+    resume = _add_resume(client, headers, 'secret python resume')
+
+    response = client.delete(f"/api/resume/{resume['id']}", headers=headers)
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert DocumentText.query.count() == 0
+        assert ResumeAnalysis.query.count() == 0
+
+
+def test_text_shared_with_another_resume_is_kept(app, client, register):
+    alice = register('alice@example.com')
+    bob = register('bob@example.com')
+    resume = _add_resume(client, alice, 'shared python resume')
+    _add_resume(client, bob, 'shared python resume')
+
+    client.delete(f"/api/resume/{resume['id']}", headers=alice)
+
+    with app.app_context():
+        assert DocumentText.query.count() == 1
+        assert ResumeAnalysis.query.count() == 1
+
+
+def _upload(client, headers, data, filename='resume.txt'):
+    response = client.post('/api/resume/upload', data={'file': (io.BytesIO(data), filename)}, headers=headers,
+                           content_type='multipart/form-data')
+    assert response.status_code == 201
+    return response.get_json()['resume']
+
+
+def test_stored_file_is_removed_with_its_last_resume(app, client, register):
+    alice = register('alice@example.com')
+    bob = register('bob@example.com')
+    first = _upload(client, alice, b'python resume file')
+    second = _upload(client, bob, b'python resume file')
+    with app.app_context():
+        storage = get_storage()
+        key = db.session.get(Resume, first['id']).file_path
+        assert storage.exists(key)
+
+    client.delete(f"/api/resume/{first['id']}", headers=alice)
+    with app.app_context():
+        assert storage.exists(key)
+
+    client.delete(f"/api/resume/{second['id']}", headers=bob)
+    with app.app_context():
+        assert not storage.exists(key)
+
+    _upload(client, alice, b'python resume file')
+    with app.app_context():
+        assert storage.exists(key)
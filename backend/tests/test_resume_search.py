@@ -0,0 +1,12 @@
+def test_search_normalizes_the_skill_name(client, register):
+    headers = register('alice@example.com')
+    response = client.post('/api/resume/analyze', json={'text': 'Python developer with PostgreSQL'},
+                           headers=headers)
+    resume_id = response.get_json()['resume']['id']
+
+    for skill in ('python', 'Python', 'Postgres', 'Python 3'):
+        data = client.get('/api/resume/search', query_string={'skill': skill}, headers=headers).get_json()
+        assert [resume['id'] for resume in data['resumes']] == [resume_id], skill
+
+    data = client.get('/api/resume/search', query_string={'skill': 'cobol'}, headers=headers).get_json()
+    assert data['resumes'] == []
@@ -0,0 +1,28 @@
+from app import create_app, db
+from config import Config
+from models.schema import upgrade_schema
+from models.skill import Skill
+
+
+def _create_skills(app, names):
+    with app.app_context():
+        ids = Skill.ids_for(names, create=True)
+        db.session.commit()
+        return ids
+
+
+def test_skill_ids_are_cached_per_database(app, tmp_path):
+    _create_skills(app, ['rust', 'python'])
+
+    class OtherConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'other.db'}"
+
+    other = create_app(OtherConfig)
+    with other.app_context():
+        upgrade_schema()
+    ids = _create_skills(other, ['python'])
+
+    with other.app_context():
+        assert Skill.names_for(ids) == ['python']
+        assert db.session.query(Skill.id).filter_by(name='python').scalar() == ids[0]
+        db.engine.dispose()
@@ -0,0 +1,161 @@
+from sqlalchemy import event, insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database profile.
+
+    DATABASE_PROFILE picks a preset from DATABASE_PROFILES ('web' for the
+    request workers, 'batch' for CLI jobs and bulk ingestion); any DB_POOL_*
+    setting that is not None overrides the preset.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if _is_memory_sqlite(url):
+        # One connection per thread by design; pool settings do not apply
+        return {}
+
+    profile = dict(config['DATABASE_PROFILES'][config['DATABASE_PROFILE']])
+    for key, setting in (
+        ('pool_size', 'DB_POOL_SIZE'),
+        ('max_overflow', 'DB_MAX_OVERFLOW'),
+        ('pool_timeout', 'DB_POOL_TIMEOUT'),
+        ('pool_recycle', 'DB_POOL_RECYCLE')
+    ):
+        if config.get(setting) is not None:
+            profile[key] = config[setting]
+    if url.get_backend_name() == 'sqlite':
+        # Local files: connections do not go stale
+        profile.pop('pool_pre_ping', None)
+    return profile
+
+
+def configure_engine(engine, config):
+    """Set the SQLite pragmas on every new connection of ``engine``.
+
+    WAL lets readers run alongside the one writer, busy_timeout makes a
+    writer wait for the lock instead of failing at once, and synchronous
+    NORMAL (safe with WAL) drops the fsync on every commit.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'] * 1000)}",
+        f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}"
+    ]
+    if not _is_memory_sqlite(engine.url):
+        pragmas.insert(0, f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def table_rows(table, records, exclude=()):
+    """Rows with a value for every column of ``table`` except ``exclude``.
+
+    Missing or None values get the column default, as an ORM insert would
+    give them; batched statements need the same keys in every row.
+    """
+    columns = [column for column in table.columns if column.name not in exclude]
+    rows = []
+    for record in records:
+        row = {}
+        for column in columns:
+            value = record.get(column.name)
+            if value is None and column.default is not None:
+                if column.default.is_scalar:
+                    value = column.default.arg
+                elif column.default.is_callable:
+                    value = column.default.arg(None)
+            row[column.name] = value
+        rows.append(row)
+    return rows
+
+
+def upsert(connection, table, rows, key_columns, update_columns=None, returning=None):
+    """Insert ``rows``, updating the existing row on a key conflict.
+
+    Every row must have the same keys. On a conflict ``update_columns``
+    (default: every non-key column given) are overwritten; with none the row
+    is left as it is. Uses INSERT ... ON CONFLICT on SQLite and PostgreSQL,
+    and one insert (then update) per row elsewhere. With ``returning``
+    (columns), the returned rows are in the order of ``rows``.
+    """
+    if not rows:
+        return []
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name not in key_columns]
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return _upsert_each(connection, table, rows, key_columns, update_columns, returning)
+
+    statement = dialect_insert(table)
+    updates = {name: statement.excluded[name] for name in update_columns}
+    if updates:
+        statement = statement.on_conflict_do_update(index_elements=key_columns, set_=updates)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=key_columns)
+    return _execute_many(connection, statement, rows, returning)
+
+
+def bulk_insert(connection, table, rows, returning=None):
+    """Insert ``rows`` (same keys each) in one batched statement.
+
+    With ``returning`` (columns), the returned rows are in the order of
+    ``rows``.
+    """
+    if not rows:
+        return []
+    return _execute_many(connection, insert(table), rows, returning)
+
+
+def _execute_many(connection, statement, rows, returning):
+    if returning is None:
+        connection.execute(statement, rows)
+        return []
+    if not connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        # No ordered RETURNING (e.g. MySQL): insert one row at a time
+        table = statement.table
+        written = []
+        for row in rows:
+            key = connection.execute(statement, row).inserted_primary_key
+            written.append(_select_row(connection, table, returning, zip(table.primary_key.columns, key)))
+        return written
+    statement = statement.returning(*returning, sort_by_parameter_order=True)
+    return connection.execute(statement, rows).all()
+
+
+def _upsert_each(connection, table, rows, key_columns, update_columns, returning):
+    """Portable upsert: insert each row in a savepoint, update it on a key conflict"""
+    written = []
+    for row in rows:
+        keys = [(table.c[name], row[name]) for name in key_columns]
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table), row)
+        except IntegrityError:
+            if update_columns:
+                connection.execute(
+                    table.update().where(*[column == value for column, value in keys])
+                    .values({name: row[name] for name in update_columns})
+                )
+        if returning is not None:
+            written.append(_select_row(connection, table, returning, keys))
+    return written
+
+
+def _select_row(connection, table, columns, keys):
+    return connection.execute(select(*columns).where(*[column == value for column, value in keys])).one()
@@ -0,0 +1,53 @@
+import base64
+from datetime import datetime
+from sqlalchemy.orm import load_only
+from app import db
+
+
+def encode_cursor(row):
+    """Opaque cursor pointing just after ``row`` in (created_at, id) order"""
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_fields(raw, model):
+    """Parse a ``?fields=a,b`` parameter against the model's API fields"""
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in model.api_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def keyset_page(query, model, cursor=None, limit=50, fields=None):
+    """Return one page of ``query`` newest first, plus the next cursor.
+
+    Uses keyset pagination on (created_at, id), so every page is an index
+    range scan no matter how deep it is, and loads only the columns the
+    requested fields need.
+    """
+    columns = {'id', 'created_at'}
+    for field in fields or model.api_fields:
+        columns.update(model.api_fields[field][0])
+    query = query.options(load_only(*[getattr(model, column) for column in sorted(columns)]))
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(db.or_(
+            model.created_at < created_at,
+            db.and_(model.created_at == created_at, model.id < row_id)
+        ))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
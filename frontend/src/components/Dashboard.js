@@ -6,6 +6,8 @@ import { FileText, Trash2, Eye, Plus, Calendar } from 'lucide-react';
 const Dashboard = ({ setCurrentResume }) => {
   const [resumes, setResumes] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -16,6 +18,7 @@ const Dashboard = ({ setCurrentResume }) => {
     try {
       const response = await listResumes();
       setResumes(response.data.resumes);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Error fetching resumes:', error);
     } finally {
@@ -23,6 +26,20 @@ const Dashboard = ({ setCurrentResume }) => {
     }
   };
 
+  // The list endpoint returns one page at a time; next_cursor fetches the next
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await listResumes(nextCursor);
+      setResumes((current) => [...current, ...response.data.resumes]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error fetching resumes:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (resumeId) => {
     if (window.confirm('Are you sure you want to delete this resume?')) {
       try {
@@ -138,6 +155,18 @@ const Dashboard = ({ setCurrentResume }) => {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="text-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-white text-indigo-600 px-6 py-3 rounded-lg font-semibold hover:bg-indigo-50 transition shadow-lg disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load More'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
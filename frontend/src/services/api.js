@@ -38,7 +38,7 @@ export const uploadResume = (formData) => {
 };
 
 export const analyzeResumeText = (text) => api.post('/resume/analyze', { text });
-export const listResumes = () => api.get('/resume/list');
+export const listResumes = (cursor) => api.get('/resume/list', { params: cursor ? { cursor } : {} });
 export const getResume = (resumeId) => api.get(`/resume/${resumeId}`);
 export const deleteResume = (resumeId) => api.delete(`/resume/${resumeId}`);
 